@@ -0,0 +1,125 @@
+import os, json, time, random, argparse, tempfile, threading, contextlib
+from datetime import datetime
+from host_link import LocalHostLink
+from event_batch import PlayerInbox
+from loadgen import summarize
+
+STATUS_FILE = "/home/minipc/Desktop/miniproyecto2/game_status.log"
+
+
+# ---------- Setup ----------
+def load_player(args):
+    """Imports player.py inside a scratch folder, pointed at a LocalHostLink."""
+    workdir = tempfile.mkdtemp(prefix="bench_player_")
+    os.chdir(workdir)  # player.py keeps its journal and spool under ./logs
+    import player
+    link = LocalHostLink(os.path.join(workdir, "host"), args.latency, args.loss, args.drop, seed=args.seed)
+    player.HOST_LINK = link
+    player.SHIP_COMPRESSED = not args.plain
+    if args.poll:
+        def no_exec(path):
+            raise OSError("exec channels disabled (--poll)")
+        link.follow = no_exec
+    print(f"Scratch folder: {workdir}")
+    return player, link
+
+def delivered(player, link):
+    """Events the host has received so far."""
+    if player.SHIP_COMPRESSED:
+        path = link._local(f"{player.HOST_TARGET_DIR}/{player.PLAYER_ID}.log")
+    else:
+        path = link._local(player.HOST_TARGET_FOLDER)
+    try:
+        with open(path, "rb") as f:
+            return sum(1 for _ in f)
+    except FileNotFoundError:
+        return 0
+
+
+# ---------- Benchmarks ----------
+def bench_shipping(player, link, events, rate, timeout):
+    link.makedirs(player.HOST_TARGET_DIR, player.HOST_INBOX_DIR)
+    inbox = PlayerInbox(link._local(player.HOST_INBOX_DIR), link._local(player.HOST_TARGET_DIR)).start()
+    player.SHIPPER.start_retry(interval=0.2)
+
+    calls = []
+    start = time.perf_counter()
+    for i in range(events):
+        t = time.perf_counter()
+        player.log_player_event("Bench", "MemoryGame", "Start", f"Event {i}")
+        calls.append(time.perf_counter() - t)
+        if rate:
+            time.sleep(1 / rate)
+
+    deadline = time.monotonic() + timeout
+    while delivered(player, link) < events and time.monotonic() < deadline:
+        time.sleep(0.01)
+    elapsed = time.perf_counter() - start
+    inbox.stop()
+
+    count = delivered(player, link)
+    journal = os.path.getsize(player.PLAYER_LOG)
+    return [summarize("log_player_event()", calls),
+            f"Shipped {count}/{events} events in {elapsed:.2f}s → {count / elapsed:.1f} events/s",
+            f"{link.requests} host requests, {link.bytes_sent} bytes sent for {journal} bytes of journal"]
+
+def bench_accept(player, link, trials, delay, mode):
+    link.makedirs(os.path.dirname(STATUS_FILE))
+    status = link._local(STATUS_FILE)
+    latencies = []
+
+    for trial in range(trials):
+        with open(status, "a", encoding="utf-8") as f:
+            f.write(json.dumps({"Action": "Start", "PlayerID": "OTHER"}) + "\n")
+
+        done = threading.Event()
+        result = {}
+
+        def wait():
+            result["stream"] = player.wait_for_host_accept()
+            result["at"] = time.perf_counter()
+            done.set()
+        threading.Thread(target=wait, daemon=True).start()
+
+        time.sleep(delay + random.uniform(0, delay))
+        written = time.perf_counter()
+        with open(status, "a", encoding="utf-8") as f:
+            f.write(json.dumps({"timestamp": datetime.now().isoformat(), "stage": "Lobby",
+                                "PlayerID": player.PLAYER_ID, "Action": "Accepted"}) + "\n")
+        if not done.wait(30):
+            continue  # counted as missing in the report
+        latencies.append(result["at"] - written)
+        if result["stream"] is not None:
+            result["stream"].stop()
+
+    return [summarize(f"accept latency ({mode})", latencies)]
+
+
+# ---------- Main ----------
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmarks player.py's event shipping and accept "
+                                                 "latency against a local stand-in of the host")
+    parser.add_argument("--events", type=int, default=500, help="events to ship (0 skips)")
+    parser.add_argument("--rate", type=float, default=0, help="events per second (0 = as fast as possible)")
+    parser.add_argument("--trials", type=int, default=20, help="accept-latency trials (0 skips)")
+    parser.add_argument("--delay", type=float, default=0.2, help="seconds before the host accepts")
+    parser.add_argument("--latency", type=float, default=0.005, help="round-trip seconds per host request")
+    parser.add_argument("--loss", type=float, default=0.0, help="probability a request loses a packet")
+    parser.add_argument("--drop", type=float, default=0.0, help="probability a request breaks the connection")
+    parser.add_argument("--plain", action="store_true", help="ship plain JSON lines instead of EVB1 batches")
+    parser.add_argument("--poll", action="store_true", help="wait for Accepted by SFTP polling")
+    parser.add_argument("--timeout", type=float, default=120, help="seconds to wait for delivery")
+    parser.add_argument("--seed", type=int)
+    parser.add_argument("--verbose", action="store_true", help="keep player.py's console output")
+    args = parser.parse_args()
+
+    player, link = load_player(args)
+    quiet = contextlib.nullcontext() if args.verbose else contextlib.redirect_stdout(open(os.devnull, "w"))
+
+    report = []
+    with quiet:
+        if args.events:
+            report += bench_shipping(player, link, args.events, args.rate, args.timeout)
+        if args.trials:
+            report += bench_accept(player, link, args.trials, args.delay, "poll" if args.poll else "stream")
+    print("\n".join(report))
@@ -0,0 +1,256 @@
+import os, sys, json, time, shutil, argparse, tempfile, subprocess
+from collections import defaultdict
+from minigames import registry  # only names and module paths, imports nothing heavy
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+POKEDEX = os.path.join(os.path.dirname(HERE), "Pokedex")
+BASELINE_FILE = os.path.join(HERE, "bench_startup_baseline.json")
+THRESHOLD = 0.20   # fraction slower than the baseline that counts as a regression
+MIN_SLACK = 0.010  # seconds; differences below this are noise, whatever the ratio
+WINDOW_TIMEOUT = 30
+
+# Code run in a fresh interpreter for every measurement. It prints IMPORTED once
+# the target's imports are done and WINDOW when its first window is painted;
+# the parent times both from the moment it spawned the process.
+CHILD = """
+import os, sys
+{imports}
+print("IMPORTED", flush=True)
+if {has_window}:
+    from PyQt6.QtCore import QObject, QEvent, QTimer
+    from PyQt6.QtWidgets import QApplication
+
+    class FirstPaint(QObject):
+        def eventFilter(self, obj, event):
+            if event.type() == QEvent.Type.Paint:
+                print("WINDOW", flush=True)
+                os._exit(0)
+            return False
+
+{show}
+    app = QApplication.instance()
+    first_paint = FirstPaint()
+    app.installEventFilter(first_paint)
+    QTimer.singleShot({timeout} * 1000, lambda: os._exit(1))
+    app.exec()
+os._exit(0)
+"""
+
+SHOW_GAME = """\
+    from minigames.shell import get_shell
+    shell = get_shell()
+    game = {module}.{attr}()
+    shell.stack.addWidget(game)
+    shell.stack.setCurrentWidget(game)
+    shell.show()"""
+
+
+# ---------- Targets ----------
+class Target:
+    def __init__(self, name, path, imports, show=None, cwd=None):
+        self.name = name
+        self.path = path  # folder the target imports its modules from
+        self.imports = imports
+        self.show = show  # code that shows its first window, if it has one
+        self.cwd = cwd    # None: a scratch folder (player/host create logs/ where they run)
+
+    def script(self):
+        return CHILD.format(imports=self.imports, has_window=self.show is not None,
+                            show=self.show or "", timeout=WINDOW_TIMEOUT)
+
+def all_targets():
+    targets = [Target("player", HERE, "import player", "    player.warm_up()"),
+               Target("host", HERE, "import host")]
+    for entry in registry.REGISTRY.values():
+        targets.append(Target(f"minigames/{entry.name}", HERE, f"import {entry.module}",
+                              SHOW_GAME.format(module=entry.module, attr=entry.attr)))
+    targets.append(Target("Pokedex/main", POKEDEX, "import main",
+                          "    main_app = QApplication(sys.argv)  # as main.py does under __main__\n"
+                          "    window = main.PantallaPrincipal()\n    window.show()", cwd=POKEDEX))
+    return targets
+
+
+# ---------- Measuring ----------
+def parse_importtime(stderr):
+    """-X importtime output -> [(module, self seconds, cumulative seconds)]"""
+    modules = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        try:
+            self_us, cumulative_us, name = line[len("import time:"):].split("|")
+            modules.append((name.strip(), int(self_us) / 1e6, int(cumulative_us) / 1e6))
+        except ValueError:
+            continue  # a line of the target's own output
+    return modules
+
+def run_once(target, scratch, cold=False, importtime=False):
+    """Starts the target in a fresh interpreter. Returns (timings, stderr)."""
+    command = [sys.executable]
+    if cold:
+        # Empty bytecode cache: every module, ours and PyQt6's, is compiled again
+        command += ["-X", f"pycache_prefix={tempfile.mkdtemp(prefix='pycache_', dir=scratch)}"]
+    if importtime:
+        command += ["-X", "importtime"]
+    command += ["-c", target.script()]
+
+    env = dict(os.environ, PYTHONPATH=target.path)
+    timings = {}
+    start = time.perf_counter()
+    process = subprocess.Popen(command, cwd=target.cwd or scratch, env=env, text=True,
+                               stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    for line in process.stdout:
+        if line.strip() == "IMPORTED":
+            timings["import"] = time.perf_counter() - start
+        elif line.strip() == "WINDOW":
+            timings["window"] = time.perf_counter() - start
+    stderr = process.stderr.read()
+    if process.wait() != 0 or "import" not in timings:
+        raise RuntimeError(f"{target.name} failed to start:\n{stderr[-2000:]}")
+    return timings, stderr
+
+def drop_caches():
+    """Empties the OS page cache (root only) so cold runs read from the SD card."""
+    try:
+        os.sync()
+        with open("/proc/sys/vm/drop_caches", "w") as f:
+            f.write("3\n")
+        return True
+    except OSError:
+        return False
+
+def median(values):
+    ordered = sorted(values)
+    return ordered[len(ordered) // 2] if ordered else None
+
+def bench_target(target, scratch, runs, cold_runs, flush_os_cache):
+    """Median cold/warm times to import and to first window, plus an import profile."""
+    samples = defaultdict(list)
+    for _ in range(cold_runs):
+        if flush_os_cache:
+            drop_caches()
+        timings, _ = run_once(target, scratch, cold=True)
+        for phase, seconds in timings.items():
+            samples[f"cold_{phase}"].append(seconds)
+
+    run_once(target, scratch)  # writes the bytecode cache
+    for _ in range(runs):
+        timings, _ = run_once(target, scratch)
+        for phase, seconds in timings.items():
+            samples[f"warm_{phase}"].append(seconds)
+
+    _, stderr = run_once(target, scratch, importtime=True)
+    return {metric: median(values) for metric, values in samples.items()}, parse_importtime(stderr)
+
+
+# ---------- Report ----------
+def by_package(modules):
+    """Self import time summed per top-level package."""
+    totals = defaultdict(float)
+    for name, self_s, _ in modules:
+        totals[name.split(".")[0]] += self_s
+    return sorted(totals.items(), key=lambda item: -item[1])
+
+def profile_lines(name, modules, top):
+    total = sum(self_s for _, self_s, _ in modules)
+    lines = [f"  {name}: {len(modules)} modules imported, {total * 1000:.1f}ms of import time"]
+    for package, seconds in by_package(modules)[:top]:
+        lines.append(f"    {package:<28} {seconds * 1000:8.1f}ms  {seconds / total:5.1%}")
+    return lines
+
+def compare(results, baseline, threshold):
+    """Lines for every metric that got slower than the baseline allows."""
+    regressions = []
+    for name, metrics in results.items():
+        for metric, seconds in metrics.items():
+            before = baseline.get(name, {}).get(metric)
+            if before is None or seconds is None:
+                continue
+            if seconds > before * (1 + threshold) and seconds - before > MIN_SLACK:
+                regressions.append(f"  {name} {metric}: {before * 1000:.0f}ms → {seconds * 1000:.0f}ms "
+                                   f"(+{seconds / before - 1:.0%})")
+    return regressions
+
+def results_table(results, baseline):
+    metrics = ["cold_import", "warm_import", "cold_window", "warm_window"]
+    lines = [f"{'target':<24}" + "".join(f"{m:>14}" for m in metrics)]
+    for name, values in results.items():
+        row = f"{name:<24}"
+        for metric in metrics:
+            seconds = values.get(metric)
+            cell = "-" if seconds is None else f"{seconds * 1000:.0f}ms"
+            before = baseline.get(name, {}).get(metric)
+            if seconds is not None and before:
+                cell += f" {seconds / before - 1:+.0%}"
+            row += f"{cell:>14}"
+        lines.append(row)
+    return lines
+
+
+# ---------- Main ----------
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Cold and warm start times of player.py, host.py, "
+                                                 "every minigame and the Pokedex, against a stored baseline")
+    parser.add_argument("--runs", type=int, default=5, help="warm runs per target (median is reported)")
+    parser.add_argument("--cold-runs", type=int, default=3, help="runs without bytecode cache per target")
+    parser.add_argument("--only", action="append", help="target to run (repeatable), e.g. player")
+    parser.add_argument("--top", type=int, default=6, help="packages listed in each import profile")
+    parser.add_argument("--offscreen", action="store_true", help="render windows offscreen (no display)")
+    parser.add_argument("--drop-caches", action="store_true",
+                        help="also empty the OS page cache before cold runs (needs root)")
+    parser.add_argument("--baseline", default=BASELINE_FILE)
+    parser.add_argument("--threshold", type=float, default=THRESHOLD,
+                        help="allowed slowdown against the baseline (0.2 = 20%%)")
+    parser.add_argument("--save-baseline", action="store_true", help="store these results as the new baseline")
+    args = parser.parse_args()
+
+    if args.offscreen:
+        os.environ["QT_QPA_PLATFORM"] = "offscreen"
+    if args.drop_caches and not drop_caches():
+        print("Can't drop the OS page cache (not root?); cold runs only skip the bytecode cache")
+        args.drop_caches = False
+
+    targets = [t for t in all_targets() if not args.only or t.name in args.only]
+    scratch = tempfile.mkdtemp(prefix="bench_startup_")
+    try:
+        baseline = {}
+        if os.path.exists(args.baseline):
+            with open(args.baseline, encoding="utf-8") as f:
+                baseline = json.load(f)
+
+        results, profiles, failed = {}, [], []
+        interpreter = Target("python (no imports)", HERE, "pass")
+        for target in [interpreter] + targets:
+            print(f"Measuring {target.name}…", file=sys.stderr)
+            try:
+                results[target.name], modules = bench_target(target, scratch, args.runs, args.cold_runs,
+                                                             args.drop_caches)
+            except RuntimeError as e:
+                print(e, file=sys.stderr)
+                failed.append(target.name)
+                continue
+            if target is not interpreter:
+                profiles += profile_lines(target.name, modules, args.top)
+    finally:
+        shutil.rmtree(scratch, ignore_errors=True)
+
+    print("\n".join(results_table(results, baseline)))
+    print("\nImport time by package, up to the first window (-X importtime, warm):")
+    print("\n".join(profiles))
+    if failed:
+        print(f"\nFailed to start: {', '.join(failed)}")
+
+    if args.save_baseline:
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+        print(f"\nBaseline saved to {args.baseline}")
+    elif baseline:
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print(f"\nSlower than the baseline by more than {args.threshold:.0%}:")
+            print("\n".join(regressions))
+        if regressions or failed:
+            sys.exit(1)
+        print(f"\nWithin {args.threshold:.0%} of the baseline.")
+    else:
+        print(f"\nNo baseline at {args.baseline}; run with --save-baseline to store one.")
@@ -0,0 +1,125 @@
+import os, sys, json, zlib, threading
+from folder_watcher import FolderWatcher
+
+# Wire format of a shipped batch: version header, then zlib-compressed
+# newline-delimited compact JSON (one event per line, each with its Seq)
+MAGIC = b"EVB1\n"
+BATCH_SUFFIX = ".evb"
+COMPRESS_LEVEL = 6
+
+
+# ---------- Codec ----------
+def compact(event):
+    return json.dumps(event, ensure_ascii=False, separators=(",", ":"))
+
+def encode_batch(lines):
+    """JSON lines (str, newline-terminated) -> EVB1 bytes."""
+    ndjson = "".join(compact(json.loads(line)) + "\n" for line in lines)
+    return MAGIC + zlib.compress(ndjson.encode("utf-8"), COMPRESS_LEVEL)
+
+def decode_batch(data):
+    """EVB1 bytes -> list of events."""
+    if not data.startswith(MAGIC):
+        raise ValueError(f"unknown batch header {data[:len(MAGIC)]!r}")
+    ndjson = zlib.decompress(data[len(MAGIC):]).decode("utf-8")
+    return [json.loads(line) for line in ndjson.splitlines() if line]
+
+def batch_name(player_id, first_seq, last_seq):
+    return f"{player_id}_{first_seq:010d}-{last_seq:010d}{BATCH_SUFFIX}"
+
+
+def last_seq_in(data):
+    """Seq of the last event in a chunk of JSON lines (0 if none has one)."""
+    for line in reversed(data.splitlines()):
+        try:
+            return json.loads(line).get("Seq", 0)
+        except ValueError:
+            continue
+    return 0
+
+def last_seq_of(path):
+    """Seq of the last event in a JSON-lines file, reading only its tail."""
+    try:
+        with open(path, "rb") as f:
+            f.seek(0, os.SEEK_END)
+            f.seek(max(0, f.tell() - 4096))
+            return last_seq_in(f.read())
+    except FileNotFoundError:
+        return 0
+
+
+# ---------- Host side ----------
+class PlayerInbox:
+    """Unpacks the batches players upload into `inbox` and appends their
+    events to `<log_dir>/<PlayerID>.log`, skipping any Seq already there
+    (a batch re-sent after a lost acknowledgement)."""
+
+    def __init__(self, inbox, log_dir):
+        self.inbox = inbox
+        self.log_dir = log_dir
+        self.watcher = FolderWatcher(inbox)
+        self.last_seq = {}  # PlayerID -> last Seq appended
+        self._stop = threading.Event()
+        self._thread = None
+
+    def ingest(self, name):
+        path = os.path.join(self.inbox, name)
+        player_id = name.rsplit("_", 1)[0]
+        try:
+            with open(path, "rb") as f:
+                events = decode_batch(f.read())
+        except (OSError, ValueError, zlib.error) as e:
+            print(f"❌ Bad batch {name}: {e}")
+            os.replace(path, path + ".bad")
+            return 0
+
+        log_path = os.path.join(self.log_dir, f"{player_id}.log")
+        if player_id not in self.last_seq:
+            self.last_seq[player_id] = last_seq_of(log_path)
+        new = [e for e in events if e.get("Seq", 0) > self.last_seq[player_id]]
+        if new:
+            with open(log_path, "a", encoding="utf-8") as f:
+                f.write("".join(compact(e) + "\n" for e in new))
+            self.last_seq[player_id] = new[-1]["Seq"]
+        os.remove(path)
+        return len(new)
+
+    def ingest_pending(self):
+        return sum(self.ingest(name) for name in self.watcher.list("", BATCH_SUFFIX))
+
+    def start(self):
+        os.makedirs(self.log_dir, exist_ok=True)
+
+        def loop():
+            while not self._stop.is_set():
+                for name in self.watcher.wait_for_any("", BATCH_SUFFIX, timeout=1):
+                    self.ingest(name)
+        self.watcher.start()
+        self._thread = threading.Thread(target=loop, name="player-inbox", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        self.watcher.stop()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self.ingest_pending()
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print("usage: event_batch.py receive <inbox> <log_dir> | cat <file.evb>")
+        sys.exit(1)
+    if sys.argv[1] == "cat":
+        with open(sys.argv[2], "rb") as f:
+            for event in decode_batch(f.read()):
+                print(compact(event))
+    elif sys.argv[1] == "receive":
+        inbox = PlayerInbox(sys.argv[2], sys.argv[3]).start()
+        print(f"📥 Receiving player batches from {inbox.inbox} → {inbox.log_dir}")
+        try:
+            threading.Event().wait()
+        except KeyboardInterrupt:
+            inbox.stop()
@@ -0,0 +1,131 @@
+import sys, json, sqlite3
+from contextlib import closing
+from log_writer import BatchedLogWriter
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS events (
+    id INTEGER PRIMARY KEY,
+    timestamp TEXT,
+    stage TEXT,
+    player_id TEXT,
+    action TEXT,
+    game_name TEXT,
+    game_id TEXT,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_events_player ON events (player_id, action);
+CREATE INDEX IF NOT EXISTS idx_events_game ON events (game_id);
+CREATE INDEX IF NOT EXISTS idx_events_stage ON events (stage);
+CREATE INDEX IF NOT EXISTS idx_events_timestamp ON events (timestamp);
+"""
+
+INSERT = ("INSERT INTO events (timestamp, stage, player_id, action, game_name, game_id, data) "
+          "VALUES (?, ?, ?, ?, ?, ?, ?)")
+
+
+def connect(path, synchronous="NORMAL"):
+    conn = sqlite3.connect(path, check_same_thread=False)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute(f"PRAGMA synchronous={synchronous}")
+    conn.executescript(SCHEMA)
+    return conn
+
+def _row(event):
+    # `data` keeps the original JSON line so the JSONL export is byte-for-byte the same
+    return (event.get("timestamp"), event.get("stage"), event.get("PlayerID"), event.get("Action"),
+            event.get("GameName"), event.get("GameID"), json.dumps(event, ensure_ascii=False))
+
+
+# ---------- Writer ----------
+class SQLiteEventStore(BatchedLogWriter):
+    """Same batching as the JSONL writer, but each batch becomes one
+    transaction in a WAL-mode SQLite database indexed by PlayerID, GameID,
+    stage and timestamp."""
+
+    def write_event(self, event):
+        self.write(_row(event))
+
+    def _open_sink(self):
+        # synchronous=FULL syncs the WAL on every commit, i.e. once per batch
+        return connect(self.path, "FULL" if self.fsync else "NORMAL")
+
+    def _write_batch(self, conn, rows):
+        with conn:
+            conn.executemany(INSERT, rows)
+
+    def _sync(self, conn):
+        if not self.fsync:
+            # WAL + synchronous=NORMAL only syncs on checkpoint
+            conn.execute("PRAGMA wal_checkpoint(FULL)")
+
+    def _close_sink(self, conn):
+        conn.close()
+
+
+# ---------- Queries ----------
+def events_for_game(db_path, game_id):
+    with closing(connect(db_path)) as conn:
+        rows = conn.execute("SELECT data FROM events WHERE game_id = ? ORDER BY id", (game_id,))
+        return [json.loads(data) for (data,) in rows]
+
+def events_for_player(db_path, player_id):
+    with closing(connect(db_path)) as conn:
+        rows = conn.execute("SELECT data FROM events WHERE player_id = ? ORDER BY id", (player_id,))
+        return [json.loads(data) for (data,) in rows]
+
+def last_event(db_path, player_id, action):
+    with closing(connect(db_path)) as conn:
+        row = conn.execute("SELECT data FROM events WHERE player_id = ? AND action = ? "
+                           "ORDER BY id DESC LIMIT 1", (player_id, action)).fetchone()
+    return json.loads(row[0]) if row else None
+
+def events_after(db_path, last_id):
+    """Events stored after row `last_id`, and the new last id (same contract as recovery.read_log_tail)."""
+    with closing(connect(db_path)) as conn:
+        rows = conn.execute("SELECT id, data FROM events WHERE id > ? ORDER BY id", (last_id,)).fetchall()
+    if not rows:
+        return [], last_id
+    return [json.loads(data) for _, data in rows], rows[-1][0]
+
+
+# ---------- JSONL import / export ----------
+def export_jsonl(db_path, out_path):
+    """Writes every stored event as one JSON line, in insertion order (game_status.log format)."""
+    count = 0
+    with closing(connect(db_path)) as conn, open(out_path, "w", encoding="utf-8") as f:
+        for (data,) in conn.execute("SELECT data FROM events ORDER BY id"):
+            f.write(data + "\n")
+            count += 1
+    return count
+
+def import_jsonl(log_path, db_path):
+    with closing(connect(db_path)) as conn, open(log_path, "r", encoding="utf-8") as f:
+        rows = []
+        for line in f:
+            try:
+                rows.append(_row(json.loads(line)))
+            except json.JSONDecodeError:
+                continue
+        with conn:
+            conn.executemany(INSERT, rows)
+    return len(rows)
+
+
+if __name__ == "__main__":
+    usage = ("usage: event_store.py export <db> <out.log> | import <log> <db> | "
+             "game <db> <GameID> | player <db> <PlayerID> | last <db> <PlayerID> <Action>")
+    if len(sys.argv) < 4:
+        sys.exit(usage)
+    command, args = sys.argv[1], sys.argv[2:]
+    if command == "export":
+        print(f"{export_jsonl(*args)} events exported → {args[1]}")
+    elif command == "import":
+        print(f"{import_jsonl(*args)} events imported → {args[1]}")
+    elif command in ("game", "player"):
+        query = events_for_game if command == "game" else events_for_player
+        for event in query(*args):
+            print(json.dumps(event, ensure_ascii=False))
+    elif command == "last" and len(args) == 3:
+        print(json.dumps(last_event(*args), ensure_ascii=False))
+    else:
+        sys.exit(usage)
@@ -0,0 +1,199 @@
+import os, time, struct, select, threading, ctypes, ctypes.util
+
+# inotify flags (see <sys/inotify.h>)
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_CLOEXEC = 0o2000000
+_EVENT_HEADER = struct.Struct("iIII")
+
+
+# ---------- inotify (Linux) ----------
+def _load_inotify():
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+        libc.inotify_init1
+        libc.inotify_add_watch
+    except (OSError, AttributeError, TypeError):
+        return None
+    return libc
+
+
+# ---------- Folder watcher ----------
+class FolderWatcher:
+    """Wakes waiting threads as soon as a file is written into `folder`.
+
+    Uses inotify when available and falls back to scanning the folder with
+    os.scandir every `poll_interval` seconds.
+    """
+
+    def __init__(self, folder, poll_interval=0.05, use_inotify=True):
+        self.folder = folder
+        self.poll_interval = poll_interval
+        self.use_inotify = use_inotify
+        self.mode = None
+        self._lock = threading.Lock()
+        self._waiters = {}         # file name -> [threading.Event]
+        self._prefix_waiters = []  # (prefix, suffix, threading.Event)
+        self._thread = None
+        self._stop = threading.Event()
+        self._fd = None
+
+    # ---------- Lifecycle ----------
+    def start(self):
+        with self._lock:
+            if self._thread is not None:
+                return self
+            os.makedirs(self.folder, exist_ok=True)
+            self._stop.clear()
+            self._fd = self._open_inotify() if self.use_inotify else None
+            self.mode = "inotify" if self._fd is not None else "scandir"
+            target = self._inotify_loop if self._fd is not None else self._scandir_loop
+            self._thread = threading.Thread(target=target, name="folder-watcher", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        thread, self._thread = self._thread, None
+        if thread is not None:
+            thread.join(timeout=1)
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+        self._wake_all()
+
+    def _open_inotify(self):
+        libc = _load_inotify()
+        if libc is None:
+            return None
+        fd = libc.inotify_init1(IN_CLOEXEC)
+        if fd < 0:
+            return None
+        wd = libc.inotify_add_watch(fd, os.fsencode(self.folder), IN_CLOSE_WRITE | IN_MOVED_TO)
+        if wd < 0:
+            os.close(fd)
+            return None
+        return fd
+
+    # ---------- Background loops ----------
+    def _inotify_loop(self):
+        fd = self._fd
+        while not self._stop.is_set():
+            try:
+                ready, _, _ = select.select([fd], [], [], 0.5)
+                if not ready:
+                    continue
+                buf = os.read(fd, 64 * 1024)
+            except (OSError, ValueError):
+                return
+            offset = 0
+            while offset + _EVENT_HEADER.size <= len(buf):
+                _, _, _, length = _EVENT_HEADER.unpack_from(buf, offset)
+                offset += _EVENT_HEADER.size
+                name = buf[offset:offset + length].rstrip(b"\0")
+                offset += length
+                if name:
+                    self._notify(os.fsdecode(name))
+
+    def _scandir_loop(self):
+        # (inode, mtime) per name: a file replaced or rewritten under the same
+        # name between two scans is new too (os.replace gives it a new inode)
+        seen = {}
+        while not self._stop.is_set():
+            current = {}
+            try:
+                with os.scandir(self.folder) as entries:
+                    for entry in entries:
+                        try:
+                            stat = entry.stat(follow_symlinks=False)
+                        except FileNotFoundError:
+                            continue
+                        current[entry.name] = (entry.inode(), stat.st_mtime_ns)
+            except FileNotFoundError:
+                pass
+            for name, version in current.items():
+                if seen.get(name) != version:
+                    self._notify(name)
+            seen = current
+            self._stop.wait(self.poll_interval)
+
+    # ---------- Dispatch ----------
+    def _notify(self, name):
+        with self._lock:
+            events = list(self._waiters.get(name, ()))
+            events += [ev for prefix, suffix, ev in self._prefix_waiters
+                       if name.startswith(prefix) and name.endswith(suffix)]
+        for ev in events:
+            ev.set()
+
+    def _wake_all(self):
+        with self._lock:
+            events = [ev for evs in self._waiters.values() for ev in evs]
+            events += [ev for _, _, ev in self._prefix_waiters]
+        for ev in events:
+            ev.set()
+
+    # ---------- Waiting ----------
+    def wait_for(self, name, timeout=None):
+        """Blocks until `name` exists in the folder. Returns its path, or None on timeout."""
+        return self.wait_for_first([name], timeout)
+
+    def wait_for_first(self, names, timeout=None):
+        """Blocks until any of `names` exists. Returns the first existing path, or None on timeout."""
+        self.start()
+        paths = [os.path.join(self.folder, name) for name in names]
+        deadline = None if timeout is None else time.monotonic() + timeout
+        ev = threading.Event()
+        with self._lock:
+            for name in names:
+                self._waiters.setdefault(name, []).append(ev)
+        try:
+            while True:
+                # Checked after registering so a file written in between is never missed
+                for path in paths:
+                    if os.path.exists(path):
+                        return path
+                if self._stop.is_set():
+                    return None
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return None
+                ev.wait(remaining)
+                ev.clear()
+        finally:
+            with self._lock:
+                for name in names:
+                    waiters = self._waiters.get(name, [])
+                    if ev in waiters:
+                        waiters.remove(ev)
+                    if not waiters:
+                        self._waiters.pop(name, None)
+
+    def wait_for_any(self, prefix, suffix=".json", timeout=None):
+        """Blocks until at least one `prefix*suffix` file exists. Returns the sorted names."""
+        self.start()
+        deadline = None if timeout is None else time.monotonic() + timeout
+        entry = (prefix, suffix, threading.Event())
+        with self._lock:
+            self._prefix_waiters.append(entry)
+        try:
+            while True:
+                names = self.list(prefix, suffix)
+                if names or self._stop.is_set():
+                    return names
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return []
+                entry[2].wait(remaining)
+                entry[2].clear()
+        finally:
+            with self._lock:
+                self._prefix_waiters.remove(entry)
+
+    def list(self, prefix, suffix=".json"):
+        try:
+            with os.scandir(self.folder) as entries:
+                return sorted(e.name for e in entries
+                              if e.name.startswith(prefix) and e.name.endswith(suffix))
+        except FileNotFoundError:
+            return []
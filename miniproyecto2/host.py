@@ -1,14 +1,50 @@
-import os, json, random, time
+import os, random, time, itertools, threading, argparse, atexit
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from folder_watcher import FolderWatcher
+from transport import FileTransport, open_transport
+from log_writer import BatchedLogWriter
+from event_store import SQLiteEventStore, events_after
+from recovery import SessionSnapshotter, SNAPSHOT_FILE, RESUME_WINDOW
+from metrics import Registry, serve_metrics
+from event_batch import PlayerInbox
 
 HOST_FOLDER = "host_folder"
+# What player.py connects to (its HOST_TRANSPORT); host_folder isn't shared
+# between the Pi and the mini-PC, so file mode only serves local tools
+DEFAULT_TRANSPORT = "tcp://0.0.0.0:5555"
 LOG_FILE = os.path.join("logs", "game_status.log")
-MINIGAMES = ["MemoryGame", "ReactionGame", "MathGame", "LogicGame"]
+# Where player.py uploads its event batches (its HOST_TARGET_DIR, batches in inbox/)
+PLAYER_LOGS = "/home/minipc/Desktop/Game_App/Player_logs"
+LOG_DB = os.path.join("logs", "game_status.db")
+# Same names the player's minigames go by
+MINIGAMES = ["MemoryGame", "EquationGame", "ReactionGame", "BalloonGame"]
+ROUNDS = ["R1", "R2"]
+GAMES_PER_ROUND = 3
+LOOKAHEAD = 2  # next games announced in every Assign so the player can prepare them
+MAX_PLAYERS = 512
+METRICS_PORT = 9100
+
+# Seconds a player gets to send each Result, per stage
+STAGE_DEADLINES = {"R1": 120, "R2": 120}
+DEFAULT_DEADLINE = 120
+HEARTBEAT_TIMEOUT = 15   # a player that heartbeats once must keep doing it
+MAX_EXTENSION = 120      # total extra seconds a slow player may ask for per game
 
 os.makedirs(HOST_FOLDER, exist_ok=True)
 os.makedirs("logs", exist_ok=True)
 
+# One watcher serves every waiting call (inotify, or scandir fallback)
+WATCHER = FolderWatcher(HOST_FOLDER)
+# File-drop by default; --transport swaps in a socket transport
+TRANSPORT = FileTransport(HOST_FOLDER, WATCHER)
+
 # ---------- Logging ----------
+# Events are appended by a background thread in batches; close() on exit
+# writes out and fsyncs whatever is still queued.
+LOG_WRITER = BatchedLogWriter(LOG_FILE)
+atexit.register(lambda: LOG_WRITER.close())
+
 def log_host_event(stage, player_id, action, game_name=None, game_id=None, extra=None):
     event = {
         "timestamp": datetime.now().isoformat(),
@@ -20,32 +56,103 @@ def log_host_event(stage, player_id, action, game_name=None, game_id=None, extra
     }
     if extra:
         event.update(extra)
-    with open(LOG_FILE, "a", encoding="utf-8") as f:
-        f.write(json.dumps(event, ensure_ascii=False) + "\n")
+    LOG_WRITER.write_event(event)
+
+# ---------- Metrics ----------
+METRICS = Registry()
+METRICS.histogram("host_join_ack_seconds", "Join received by the host until its Ack is sent")
+METRICS.histogram("host_assign_result_seconds", "Assign sent until the Result is received")
+METRICS.histogram("host_round_duration_seconds", "Round Start to End")
+METRICS.histogram("host_game_duration_seconds", "Player accepted to Game End")
+
+# ---------- Sessions ----------
+class SessionTimeout(Exception):
+    pass
+
+class SessionSuperseded(Exception):
+    """The player joined again on a new connection, which takes the session over."""
+
+class HostSession:
+    def __init__(self, player_id, stage="Lobby", games_done=0, game_name=None, game_id=None, **_):
+        self.player_id = player_id
+        self.stage = stage
+        self.games_done = games_done
+        self.game_name = game_name
+        self.game_id = game_id
+        self.joined_at = time.time()
+        self.left_at = None  # set while the session waits for the player to re-join
+        self.last_heartbeat = None
+        self.superseded = threading.Event()  # a newer Join is taking the session over
+        self.stopped = threading.Event()     # no game cycle is running it
+        self.stopped.set()
+        # Every game of the session is drawn up front so Assigns can announce the next ones
+        self.plan = [random.choice(MINIGAMES) for _ in range(len(ROUNDS) * GAMES_PER_ROUND)]
+
+    def upcoming(self):
+        return self.plan[self.games_done + 1:self.games_done + 1 + LOOKAHEAD]
+
+    def next_games(self):
+        """The game about to be assigned (or re-sent) and the ones after it."""
+        current = [self.game_name] if self.game_name else self.plan[self.games_done:self.games_done + 1]
+        return current + self.upcoming()
+
+    def check_current(self):
+        if self.superseded.is_set():
+            raise SessionSuperseded("player re-joined on a new connection")
+
+    @property
+    def expired(self):
+        return self.left_at is not None and time.time() - self.left_at > RESUME_WINDOW.total_seconds()
+
+    @property
+    def resumed(self):
+        return self.games_done > 0 or self.game_id is not None or self.stage != "Lobby"
 
 # ---------- ACK connection ----------
-def wait_for_join(player_id):
-    join_path = os.path.join(HOST_FOLDER, f"join_{player_id}.json")
+def wait_for_join(player_id, session=None):
     print("🖥️ Host waiting for Join request...")
-    while not os.path.exists(join_path):
-        time.sleep(1)
-    with open(join_path, "r", encoding="utf-8") as f:
-        join_data = json.load(f)
-    os.remove(join_path)
+    TRANSPORT.recv("join", player_id)
+    accept_join(player_id, session, time.monotonic())
 
-    print(f"✅ Player {player_id} connected (Join received)")
-    log_host_event("Lobby", player_id, "Accepted")
+def accept_join(player_id, session=None, received_at=None):
+    ack_data = {"Action": "Accepted", "PlayerID": player_id, "timestamp": datetime.now().isoformat()}
+    if session is not None:
+        # Lets the player build the first games while the host is still in the Lobby
+        ack_data["Upcoming"] = session.next_games()
+    if session is not None and session.resumed:
+        resume = {"Resume": True, "ResumeStage": session.stage, "GamesDone": session.games_done,
+                  "PendingGameID": session.game_id}
+        print(f"♻️ Player {player_id} reconnected, resuming at {session.stage} ({session.games_done} games done)")
+        log_host_event("Lobby", player_id, "Accepted", extra=resume)
+        ack_data.update(resume)
+    else:
+        print(f"✅ Player {player_id} connected (Join received)")
+        log_host_event("Lobby", player_id, "Accepted")
 
+    drop_stale_messages(player_id)
     # Send ACK
-    ack_data = {"Action": "Accepted", "PlayerID": player_id, "timestamp": datetime.now().isoformat()}
-    ack_path = os.path.join(HOST_FOLDER, f"ack_{player_id}.json")
-    with open(ack_path, "w", encoding="utf-8") as f:
-        json.dump(ack_data, f, ensure_ascii=False, indent=4)
+    TRANSPORT.send("ack", player_id, ack_data)
+    if received_at is not None:
+        # Host clock only: the player's timestamp is on another machine's clock
+        METRICS.observe("host_join_ack_seconds", time.monotonic() - received_at)
+
+def drop_stale_messages(player_id):
+    # Results and heartbeats left over from the player's previous connection;
+    # a pending game is re-assigned, so its result will be sent again
+    for kind in ("result", "heartbeat"):
+        while TRANSPORT.recv(kind, player_id, 0) is not None:
+            pass
 
 # ---------- Game management ----------
-def assign_minigame(stage, player_id):
-    game = random.choice(MINIGAMES)
-    game_id = f"{player_id}_{int(time.time())}"
+_assign_count = itertools.count(1)  # numbers games assigned without a session
+
+def assign_minigame(stage, player_id, game=None, game_id=None, upcoming=None, number=None):
+    # game/game_id are given when re-sending a pending assignment after a restart
+    game = game or random.choice(MINIGAMES)
+    # The game's number in the session tells apart games assigned in the same
+    # millisecond; the time tells apart sessions of the same player
+    number = number or next(_assign_count)
+    game_id = game_id or f"{player_id}_{number}_{int(time.time() * 1000)}"
     assignment = {
         "PlayerID": player_id,
         "stage": stage,
@@ -54,21 +161,53 @@ def assign_minigame(stage, player_id):
         "Action": "Assign",
         "timestamp": datetime.now().isoformat()
     }
+    if upcoming:
+        assignment["Upcoming"] = upcoming
 
-    assign_path = os.path.join(HOST_FOLDER, f"assign_{player_id}.json")
-    with open(assign_path, "w", encoding="utf-8") as f:
-        json.dump(assignment, f, ensure_ascii=False, indent=4)
-
+    TRANSPORT.send("assign", player_id, assignment)
     log_host_event(stage, player_id, "Assign", game, game_id)
     print(f"🎮 Assigned {game} to {player_id} ({stage})")
+    return game, game_id
+
+def wait_for_result(player_id, session=None, stage=None):
+    if session is None:
+        session = HostSession(player_id)
+    now = time.monotonic()
+    deadline = now + STAGE_DEADLINES.get(stage, DEFAULT_DEADLINE)
+    extension_left = MAX_EXTENSION
+
+    while True:
+        session.check_current()
+        result_data = TRANSPORT.recv("result", player_id, timeout=min(1.0, max(0, deadline - now)))
+        if result_data is not None:
+            if result_data.get("GameID") == session.game_id:
+                break
+            print(f"⚠️ Stale result from {player_id} ignored: {result_data.get('GameID')} "
+                  f"(waiting for {session.game_id})")
+        if TRANSPORT.closed:
+            raise ConnectionError("transport closed while waiting for result")
 
-def wait_for_result(player_id):
-    result_path = os.path.join(HOST_FOLDER, f"result_{player_id}.json")
-    while not os.path.exists(result_path):
-        time.sleep(1)
-    with open(result_path, "r", encoding="utf-8") as f:
-        result_data = json.load(f)
-    os.remove(result_path)
+        # Heartbeats prove the player is alive; "Extend" asks for more time
+        while (heartbeat := TRANSPORT.recv("heartbeat", player_id, 0)) is not None:
+            session.last_heartbeat = time.monotonic()
+            extend = min(float(heartbeat.get("Extend") or 0), extension_left)
+            if extend > 0:
+                deadline += extend
+                extension_left -= extend
+                print(f"⏳ {player_id} asked for {extend:.0f}s more ({stage})")
+
+        now = time.monotonic()
+        alive = session.last_heartbeat is not None and now - session.last_heartbeat <= HEARTBEAT_TIMEOUT
+        if now >= deadline and alive and extension_left > 0:
+            # Still heartbeating: slow, not dead
+            grant = min(HEARTBEAT_TIMEOUT, extension_left)
+            deadline += grant
+            extension_left -= grant
+            print(f"⏳ {player_id} is slow but alive, {grant:.0f}s more ({stage})")
+        if now >= deadline:
+            raise SessionTimeout(f"no result within the {stage} deadline")
+        if session.last_heartbeat is not None and now - session.last_heartbeat > HEARTBEAT_TIMEOUT:
+            raise SessionTimeout(f"no heartbeat for {HEARTBEAT_TIMEOUT}s")
 
     log_host_event(result_data["stage"], player_id, "ResultReceived",
                    result_data["GameName"], result_data["GameID"])
@@ -88,33 +227,246 @@ def maybe_apply_sabotage(stage, player_id):
             "Effect": effect,
             "Value": value
         }
-        sabotage_path = os.path.join(HOST_FOLDER, f"sabotage_{player_id}.json")
-        with open(sabotage_path, "w", encoding="utf-8") as f:
-            json.dump(sabotage, f, ensure_ascii=False, indent=4)
+        TRANSPORT.send("sabotage", player_id, sabotage)
         log_host_event(stage, player_id, "Sabotage", extra={"Effect": effect, "Value": value})
         print(f"⚠️ Sabotage applied to {player_id}: {effect} ({value})")
 
 # ---------- Main cycle ----------
-def host_game_cycle(player_id):
-    wait_for_join(player_id)
-    print("🖥️ Host: entering Lobby...")
-    log_host_event("Lobby", player_id, "Start")
-    time.sleep(2)
-
-    for round_name in ["R1", "R2"]:
-        print(f"🚀 Starting {round_name}...")
-        log_host_event(round_name, player_id, "Start")
-
-        for _ in range(3):
-            assign_minigame(round_name, player_id)
-            stage = wait_for_result(player_id)
+def host_game_cycle(player_id, session=None):
+    if session is None:
+        session = HostSession(player_id)
+        wait_for_join(player_id, session)
+    # A session restored after a host restart skips what was already played
+    resumed = session.resumed
+    game_started = time.monotonic()
+    if not resumed:
+        print(f"🖥️ Host: {player_id} entering Lobby...")
+        log_host_event("Lobby", player_id, "Start")
+        session.superseded.wait(2)
+
+    for round_index, round_name in enumerate(ROUNDS):
+        first_game = session.games_done - round_index * GAMES_PER_ROUND
+        if first_game >= GAMES_PER_ROUND:
+            continue
+        first_game = max(first_game, 0)
+        mid_round = resumed and (first_game > 0 or session.game_id is not None)
+        session.stage = round_name
+        round_started = time.monotonic()
+        if not mid_round:
+            print(f"🚀 {player_id}: starting {round_name}...")
+            log_host_event(round_name, player_id, "Start")
+
+        for _ in range(first_game, GAMES_PER_ROUND):
+            session.check_current()
+            game = session.game_name or session.plan[session.games_done]
+            session.game_name, session.game_id = assign_minigame(round_name, player_id, game,
+                                                                 session.game_id, session.upcoming(),
+                                                                 session.games_done + 1)
+            assigned_at = time.monotonic()
+            stage = wait_for_result(player_id, session, round_name)
+            METRICS.observe("host_assign_result_seconds", time.monotonic() - assigned_at,
+                            GameName=session.game_name, stage=round_name)
+            session.games_done += 1
+            session.game_name = session.game_id = None
             maybe_apply_sabotage(stage, player_id)
 
-        print(f"✅ {round_name} finished.")
+        print(f"✅ {player_id}: {round_name} finished.")
         log_host_event(round_name, player_id, "End")
+        if not mid_round:
+            METRICS.observe("host_round_duration_seconds", time.monotonic() - round_started, stage=round_name)
 
-    print("🏁 Game completed!")
+    session.stage = "Done"
+    if not resumed:
+        METRICS.observe("host_game_duration_seconds", time.monotonic() - game_started)
+    print(f"🏁 {player_id}: game completed!")
     log_host_event("Game", player_id, "End")
 
+# ---------- Setup ----------
+def configure_host(folder=HOST_FOLDER, transport="file", log_file=LOG_FILE, log_db=LOG_DB,
+                   log_backend="jsonl", fsync=False, snapshot_file=SNAPSHOT_FILE):
+    """Points the shared watcher, transport and log writer at their targets and
+    returns the snapshotter for the chosen log."""
+    global HOST_FOLDER, WATCHER, TRANSPORT, LOG_WRITER
+    if transport.startswith("file:"):
+        folder, transport = transport[len("file:"):] or folder, "file"
+    if folder != HOST_FOLDER:
+        HOST_FOLDER = folder
+        os.makedirs(folder, exist_ok=True)
+        WATCHER = FolderWatcher(folder)
+        TRANSPORT = FileTransport(folder, WATCHER)
+    if transport != "file":
+        TRANSPORT = open_transport(transport, "host", folder, WATCHER)
+        print(f"🔌 Listening on {transport}")
+
+    if log_backend == "sqlite":
+        LOG_WRITER = SQLiteEventStore(log_db, fsync=fsync)
+        print(f"🗄️ Logging events to {log_db}")
+        return SessionSnapshotter(log_db, snapshot_file, flush=LOG_WRITER.flush, tail=events_after)
+    if log_file != LOG_WRITER.path:
+        LOG_WRITER = BatchedLogWriter(log_file)
+    LOG_WRITER.fsync = fsync
+    return SessionSnapshotter(log_file, snapshot_file, flush=LOG_WRITER.flush)
+
+def run_engine(max_players=MAX_PLAYERS, snapshotter=None):
+    engine = HostEngine(max_players, snapshotter)
+    try:
+        engine.serve_forever()
+    except KeyboardInterrupt:
+        print("🛑 Host stopping...")
+        engine.shutdown(wait=False)
+
+# ---------- Multi-player engine ----------
+class HostEngine:
+    """Accepts Join requests from any player and runs one game cycle per player
+    on a thread pool, all sharing the folder watcher and the log writer."""
+
+    def __init__(self, max_players=MAX_PLAYERS, snapshotter=None):
+        self.max_players = max_players
+        self.sessions = {}  # PlayerID -> HostSession
+        self.restored = {}  # PlayerID -> HostSession waiting for the player to re-join
+        self._lock = threading.Lock()
+        self._pool = ThreadPoolExecutor(max_workers=max_players, thread_name_prefix="session")
+        self._running = False
+        self.snapshotter = snapshotter
+        if snapshotter is not None:
+            for player_id, state in snapshotter.recover().items():
+                self.restored[player_id] = HostSession(player_id, **state)
+            if self.restored:
+                print(f"♻️ Restored {len(self.restored)} session(s) from snapshot + log tail")
+            snapshotter.start()
+        METRICS.gauge("host_active_sessions", "Players currently in a game cycle", lambda: len(self.sessions))
+
+    def serve_forever(self):
+        self._running = True
+        print(f"🖥️ Host waiting for Join requests (up to {self.max_players} players)...")
+        while self._running:
+            for player_id, _ in TRANSPORT.recv_any("join", timeout=0.5):
+                self._handle_join(player_id, time.monotonic())
+
+    def _handle_join(self, player_id, received_at=None):
+        with self._lock:
+            session = self.sessions.get(player_id)
+            if session is not None:
+                if session.superseded.is_set():
+                    print(f"⚠️ {player_id} is already re-joining, Join ignored")
+                    return
+                # Same player on a new connection: stop the old cycle, then resume from it
+                session.superseded.set()
+                self._pool.submit(self._take_over, session, received_at)
+                return
+            if len(self.sessions) >= self.max_players:
+                print(f"⚠️ Host full, Join from {player_id} ignored")
+                return
+            session = self.restored.pop(player_id, None)
+            if session is None or session.expired:
+                session = HostSession(player_id)
+            self.sessions[player_id] = session
+        if self._accept(session, received_at):
+            self._pool.submit(self._run_session, session)
+
+    def _accept(self, session, received_at):
+        session.left_at = session.last_heartbeat = None
+        try:
+            accept_join(session.player_id, session, received_at)
+            return True
+        except OSError as e:
+            # Gone between its Join and the Ack: keep the session for its next Join
+            print(f"❌ Could not send the Ack to {session.player_id}: {e}")
+            with self._lock:
+                self.sessions.pop(session.player_id, None)
+                session.left_at = time.time()
+                self.restored[session.player_id] = session
+            return False
+
+    def _take_over(self, session, received_at):
+        session.stopped.wait()  # the old cycle checks `superseded` at least once a second
+        print(f"♻️ {session.player_id} re-joined, handing its session over")
+        if session.stage == "Done":
+            with self._lock:
+                session = self.sessions[session.player_id] = HostSession(session.player_id)
+        session.superseded.clear()
+        if self._accept(session, received_at):
+            self._run_session(session)
+
+    def _run_session(self, session):
+        session.stopped.clear()
+        keep = True  # unfinished sessions wait in self.restored for the player to re-join
+        try:
+            host_game_cycle(session.player_id, session)
+            keep = False
+        except SessionSuperseded:
+            pass
+        except Exception as e:
+            if not self._running:
+                pass  # stopped by shutdown(): nothing is logged, so a restart resumes it
+            elif isinstance(e, SessionTimeout):
+                # Reap the session: the player crashed or lost its connection
+                print(f"⏰ Session {session.player_id} timed out: {e}")
+                log_host_event(session.stage, session.player_id, "Timeout",
+                               session.game_name, session.game_id, extra={"Reason": str(e)})
+            elif isinstance(e, ConnectionError):
+                print(f"🔌 {session.player_id} disconnected: {e}")
+                log_host_event(session.stage, session.player_id, "Disconnected", extra={"Reason": str(e)})
+            else:
+                print(f"❌ Session {session.player_id} failed: {e}")
+                log_host_event(session.stage, session.player_id, "Error", extra={"Error": str(e)})
+                keep = False
+        finally:
+            with self._lock:
+                if not session.superseded.is_set():
+                    self.sessions.pop(session.player_id, None)
+                    if keep:
+                        session.left_at = time.time()
+                        self.restored[session.player_id] = session
+                session.stopped.set()
+
+    def shutdown(self, wait=True):
+        self._running = False
+        TRANSPORT.close()
+        self._pool.shutdown(wait=wait, cancel_futures=True)
+        if self.snapshotter is not None:
+            self.snapshotter.stop()
+        LOG_WRITER.close()
+
 if __name__ == "__main__":
-    host_game_cycle("P001")
+    parser = argparse.ArgumentParser(description="Game host")
+    parser.add_argument("--player", help="run a single game cycle for this PlayerID")
+    parser.add_argument("--max-players", type=int, default=MAX_PLAYERS)
+    parser.add_argument("--transport", default=DEFAULT_TRANSPORT,
+                        help=f"{DEFAULT_TRANSPORT} (default), file, file:<folder>, unix:/path/host.sock "
+                             "or tcp://<ip>:<port>")
+    parser.add_argument("--log-backend", choices=["jsonl", "sqlite"], default="jsonl",
+                        help="jsonl (game_status.log, read by players) or sqlite (indexed, WAL)")
+    parser.add_argument("--deadline", action="append", default=[], metavar="STAGE=SECONDS",
+                        help="seconds allowed per Result in a stage, e.g. --deadline R1=60")
+    parser.add_argument("--metrics-port", type=int, default=METRICS_PORT,
+                        help="port for the local Prometheus /metrics endpoint (0 disables it)")
+    parser.add_argument("--no-recovery", action="store_true",
+                        help="don't restore sessions from the last snapshot")
+    parser.add_argument("--fsync", action="store_true", help="fsync every log batch (group commit)")
+    parser.add_argument("--player-logs", metavar="DIR", default=PLAYER_LOGS,
+                        help="unpack compressed player batches uploaded to DIR/inbox into DIR/<PlayerID>.log "
+                             f"(default {PLAYER_LOGS}; '' disables it)")
+    args = parser.parse_args()
+
+    for item in args.deadline:
+        stage, _, seconds = item.partition("=")
+        STAGE_DEADLINES[stage] = float(seconds)
+
+    snapshotter = configure_host(transport=args.transport, log_backend=args.log_backend, fsync=args.fsync)
+
+    if args.metrics_port:
+        serve_metrics(METRICS, args.metrics_port)
+        print(f"📊 Metrics on http://127.0.0.1:{args.metrics_port}/metrics")
+
+    if args.player_logs:
+        try:
+            PlayerInbox(os.path.join(args.player_logs, "inbox"), args.player_logs).start()
+            print(f"📥 Player batches: {args.player_logs}/inbox → {args.player_logs}/<PlayerID>.log")
+        except OSError as e:
+            print(f"⚠️ Not unpacking player batches ({args.player_logs}: {e})")
+
+    if args.player:
+        host_game_cycle(args.player)
+    else:
+        run_engine(args.max_players, None if args.no_recovery else snapshotter)
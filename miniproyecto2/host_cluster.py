@@ -0,0 +1,215 @@
+import os, sys, json, heapq, bisect, signal, hashlib, argparse, threading, multiprocessing
+from datetime import datetime
+from transport import FileTransport, open_transport
+from recovery import read_log_tail
+
+HOST_FOLDER = "host_folder"
+LOG_FILE = os.path.join("logs", "game_status.log")
+WORKERS = 4
+MERGE_INTERVAL = 0.5  # seconds
+
+
+# ---------- Consistent hashing ----------
+def _hash(key):
+    return int.from_bytes(hashlib.md5(key.encode("utf-8")).digest()[:8], "big")
+
+class HashRing:
+    """PlayerID -> shard. Adding or removing a shard only moves ~1/N of the players."""
+
+    def __init__(self, nodes, replicas=100):
+        self._ring = sorted((_hash(f"{node}#{i}"), node) for node in nodes for i in range(replicas))
+        self._keys = [h for h, _ in self._ring]
+
+    def node_for(self, key):
+        index = bisect.bisect(self._keys, _hash(key)) % len(self._ring)
+        return self._ring[index][1]
+
+
+# ---------- Shards ----------
+def shard_name(index):
+    return f"shard_{index}"
+
+def shard_log(index):
+    return os.path.join("logs", f"game_status.{shard_name(index)}.log")
+
+def shard_folder(spec, index):
+    """Sub-folder of the router's folder (`file:<folder>` or HOST_FOLDER) that worker `index` watches."""
+    root = spec[len("file:"):] if spec.startswith("file:") else ""
+    return os.path.join(root or HOST_FOLDER, shard_name(index))
+
+def shard_address(spec, index):
+    """Where worker `index` listens: its own sub-folder, socket path or port."""
+    if spec == "file" or spec.startswith("file:"):
+        return "file"
+    if spec.startswith("unix:"):
+        root, ext = os.path.splitext(spec[len("unix:"):])
+        return f"unix:{root}.{shard_name(index)}{ext or '.sock'}"
+    host, _, port = spec[len("tcp://"):].rpartition(":")
+    return f"tcp://{host}:{int(port) + 1 + index}"
+
+def run_worker(index, spec, max_players, metrics_port, stop):
+    # Only the router stops workers (through `stop`), so a Ctrl-C that reaches
+    # the whole process group doesn't interrupt a shutdown already under way
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    import host  # imported in the worker process only
+    name = shard_name(index)
+    snapshotter = host.configure_host(folder=shard_folder(spec, index),
+                                      transport=shard_address(spec, index),
+                                      log_file=shard_log(index),
+                                      snapshot_file=os.path.join("logs", f"host_snapshot.{name}.json"))
+    if metrics_port:
+        host.serve_metrics(host.METRICS, metrics_port + index)
+    print(f"🧩 Worker {name} ready (pid {os.getpid()})")
+    engine = host.HostEngine(max_players, snapshotter)
+
+    def stop_when_asked():
+        stop.wait()
+        engine.shutdown(wait=False)  # ends serve_forever; writes out the log and the last snapshot
+    threading.Thread(target=stop_when_asked, name="worker-stop").start()
+    engine.serve_forever()
+
+
+# ---------- Front process ----------
+class Router:
+    """Receives every Join on the public folder/socket and routes the player to
+    the worker that owns its PlayerID."""
+
+    def __init__(self, spec, workers):
+        self.spec = spec
+        self.workers = workers
+        self.ring = HashRing([shard_name(i) for i in range(workers)])
+        self.transport = open_transport(spec, "host", HOST_FOLDER)
+        self._running = False
+
+    def serve_forever(self):
+        self._running = True
+        print(f"🖥️ Router sharding players across {self.workers} workers...")
+        while self._running:
+            for player_id, join in self.transport.recv_any("join", timeout=0.5):
+                self.route(player_id, join)
+
+    def route(self, player_id, join):
+        name = self.ring.node_for(player_id)
+        index = int(name.rsplit("_", 1)[1])
+        if isinstance(self.transport, FileTransport):
+            # Forward the Join so the worker sees it without the player re-sending
+            self.transport.shard(name).send("join", player_id, join)
+        route = {"Action": "Route", "PlayerID": player_id, "Shard": name,
+                 "Address": shard_address(self.spec, index), "timestamp": datetime.now().isoformat()}
+        try:
+            self.transport.send("route", player_id, route)
+        except ConnectionError as e:
+            print(f"❌ Could not route {player_id}: {e}")
+            return
+        print(f"🔀 {player_id} → {name}")
+
+    def stop(self):
+        self._running = False
+        self.transport.close()
+
+
+# ---------- Merged log ----------
+def _timestamp(event):
+    return event.get("timestamp") or ""
+
+def merge_logs(paths, out_path):
+    """Merges per-shard logs (each already in time order) into one JSONL file sorted by timestamp."""
+    streams = [read_log_tail(path, 0)[0] for path in paths]
+    count = 0
+    with open(out_path, "w", encoding="utf-8") as f:
+        for event in heapq.merge(*streams, key=_timestamp):
+            f.write(json.dumps(event, ensure_ascii=False) + "\n")
+            count += 1
+    return count
+
+class LogMerger:
+    """Follows the shard logs and appends their new lines, in timestamp order,
+    to the combined game_status.log that analytics and players read."""
+
+    def __init__(self, paths, out_path=LOG_FILE, interval=MERGE_INTERVAL):
+        self.paths = paths
+        self.out_path = out_path
+        self.interval = interval
+        self.offsets = {path: 0 for path in paths}
+        self._stop = threading.Event()
+        self._thread = None
+
+    def merge_once(self):
+        streams = []
+        for path in self.paths:
+            events, self.offsets[path] = read_log_tail(path, self.offsets[path])
+            streams.append(events)
+        lines = [json.dumps(event, ensure_ascii=False) + "\n"
+                 for event in heapq.merge(*streams, key=_timestamp)]
+        if lines:
+            with open(self.out_path, "a", encoding="utf-8") as f:
+                f.write("".join(lines))
+        return len(lines)
+
+    def start(self):
+        # Only lines written from now on; older ones are in the segments already
+        for path in self.paths:
+            self.offsets[path] = os.path.getsize(path) if os.path.exists(path) else 0
+
+        def loop():
+            while not self._stop.wait(self.interval):
+                self.merge_once()
+        self._thread = threading.Thread(target=loop, name="log-merger", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        self.merge_once()
+
+
+# ---------- Main ----------
+def run_cluster(workers=WORKERS, spec="file", max_players=512, metrics_port=0):
+    os.makedirs("logs", exist_ok=True)
+    # spawn: workers start clean instead of inheriting the router's threads
+    context = multiprocessing.get_context("spawn")
+    stop = context.Event()
+    processes = [context.Process(target=run_worker, name=shard_name(i), daemon=True,
+                                 args=(i, spec, max_players, metrics_port, stop))
+                 for i in range(workers)]
+    for process in processes:
+        process.start()
+
+    merger = LogMerger([shard_log(i) for i in range(workers)])
+    merger.start()
+    router = Router(spec, workers)
+    try:
+        router.serve_forever()
+    except KeyboardInterrupt:
+        print("🛑 Cluster stopping...")
+    finally:
+        router.stop()
+        stop.set()
+        for process in processes:
+            process.join(timeout=5)
+            if process.is_alive():
+                process.terminate()
+        merger.stop()
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == "merge":
+        out = sys.argv[2] if len(sys.argv) > 2 else os.path.join("logs", "game_status.merged.log")
+        segments = sorted(os.path.join("logs", name) for name in os.listdir("logs")
+                          if name.startswith("game_status.shard_") and name.endswith(".log"))
+        print(f"{merge_logs(segments, out)} events merged from {len(segments)} segments → {out}")
+        sys.exit(0)
+
+    parser = argparse.ArgumentParser(description="Sharded game host: one router + N host workers",
+                                     epilog="`host_cluster.py merge [out]` merges the shard logs offline")
+    parser.add_argument("--workers", type=int, default=WORKERS)
+    parser.add_argument("--transport", default="tcp://0.0.0.0:5555",
+                        help="tcp://0.0.0.0:5555 (default, where player.py connects), file, "
+                             "file:<folder>, unix:/path/host.sock; "
+                             "workers use sub-folders, <path>.shard_N.sock or the following ports")
+    parser.add_argument("--max-players", type=int, default=512, help="per worker")
+    parser.add_argument("--metrics-port", type=int, default=0,
+                        help="first worker's /metrics port, the others follow (0 disables)")
+    args = parser.parse_args()
+    run_cluster(args.workers, args.transport, args.max_players, args.metrics_port)
@@ -0,0 +1,244 @@
+import os, time, random, socket, threading
+
+# Seconds to wait before each reconnect attempt after a failure
+RECONNECT_BACKOFF = [0.5, 1, 2, 5, 10]
+
+
+# ---------- Helpers ----------
+def start_of_last_line(link, path, size, chunk=4096):
+    """Offset where the last complete line of the remote file begins."""
+    end = size - 1  # skip the trailing newline
+    while end > 0:
+        start = max(0, end - chunk)
+        data = link.read(path, start, end - start)
+        newline = data.rfind(b"\n")
+        if newline >= 0:
+            return start + newline + 1
+        end = start
+    return 0
+
+
+# ---------- SSH (the real mini-PC) ----------
+class SSHHostLink:
+    """Everything the player does on the host, over one lazily opened SSH
+    connection and SFTP session that are reused until they fail."""
+
+    def __init__(self, host, port, username, password, backoff=RECONNECT_BACKOFF):
+        self.host = host
+        self.port = port
+        self.username = username
+        self.password = password
+        self.backoff = backoff
+        self.lock = threading.RLock()  # callers hold it across multi-step operations
+        self._ssh = None
+        self._sftp = None
+        self._failures = 0
+        self._next_connect = 0.0
+        self._folders = set()  # remote folders known to exist on this connection
+
+    def _session(self):
+        with self.lock:
+            transport = self._ssh.get_transport() if self._ssh else None
+            if self._sftp is not None and transport is not None and transport.is_active():
+                return self._sftp
+
+            self.close()
+
+            # Back off after failures instead of hammering an unreachable host
+            if time.monotonic() < self._next_connect:
+                raise ConnectionError("host unreachable, waiting before reconnecting")
+
+            import paramiko  # only needed when talking to a real host
+            ssh = paramiko.SSHClient()
+            ssh.set_missing_host_key_policy(paramiko.AutoAddPolicy())
+            try:
+                ssh.connect(self.host, self.port, self.username, self.password, timeout=10)
+                ssh.get_transport().set_keepalive(15)
+                self._sftp = ssh.open_sftp()
+                self._ssh = ssh
+            except Exception:
+                ssh.close()
+                delay = self.backoff[min(self._failures, len(self.backoff) - 1)]
+                self._failures += 1
+                self._next_connect = time.monotonic() + delay
+                raise
+
+            self._failures = 0
+            print(f"[SSH] Connected to {self.host}")
+            return self._sftp
+
+    def close(self):
+        with self.lock:
+            for conn in (self._sftp, self._ssh):
+                try:
+                    if conn is not None:
+                        conn.close()
+                except Exception:
+                    pass
+            self._ssh = self._sftp = None
+            self._folders.clear()  # re-checked on the next connection
+
+    def size(self, path):
+        """Size of the remote file, or None if it doesn't exist."""
+        try:
+            return self._session().stat(path).st_size
+        except FileNotFoundError:
+            return None
+
+    def makedirs(self, *folders):
+        with self.lock:
+            sftp = self._session()
+            for folder in folders:
+                if folder in self._folders:
+                    continue
+                try:
+                    sftp.stat(folder)
+                except FileNotFoundError:
+                    sftp.mkdir(folder)
+                self._folders.add(folder)
+
+    def read(self, path, offset, length=None):
+        with self._session().open(path, "rb") as remote_file:
+            remote_file.seek(offset)
+            return remote_file.read(length) if length is not None else remote_file.read()
+
+    def append(self, path, data):
+        with self._session().open(path, "ab") as remote_file:
+            remote_file.write(data)
+
+    def write(self, path, data):
+        """Replaces `path` atomically: readers never see a partial file."""
+        sftp = self._session()
+        with sftp.open(path + ".tmp", "wb") as remote_file:
+            remote_file.write(data)
+        sftp.posix_rename(path + ".tmp", path)
+
+    def upload(self, local_path, path):
+        self._session().put(local_path, path)
+
+    def follow(self, path):
+        """Channel streaming `tail -F path` (starting at its last line);
+        recv() raises socket.timeout after a second without data."""
+        with self.lock:
+            self._session()
+            channel = self._ssh.get_transport().open_session()
+        channel.exec_command(f"tail -n 1 -F {path}")
+        channel.settimeout(1.0)
+        return channel
+
+
+# ---------- Local stand-in ----------
+class _LocalFollower:
+    """tail -F over a local file with the same recv()/close() as an SSH channel."""
+
+    def __init__(self, link, path):
+        self.link = link
+        self.path = path
+        self.offset = None
+        self.closed = False
+
+    def recv(self, size, timeout=1.0):
+        deadline = time.monotonic() + timeout
+        while not self.closed:
+            current = os.path.getsize(self.path) if os.path.exists(self.path) else 0
+            if self.offset is None:
+                self.offset = start_of_last_line(self.link, self.link._remote(self.path), current) \
+                    if current else 0
+            elif current < self.offset:
+                self.offset = 0  # rotated
+            if current > self.offset:
+                with open(self.path, "rb") as f:
+                    f.seek(self.offset)
+                    data = f.read(min(size, current - self.offset))
+                self.offset += len(data)
+                time.sleep(self.link.latency / 2)  # one way, host -> player
+                return data
+            if time.monotonic() >= deadline:
+                raise socket.timeout()
+            time.sleep(0.005)
+        return b""
+
+    def close(self):
+        self.closed = True
+
+class LocalHostLink:
+    """Filesystem-backed fake of the mini-PC for benchmarks and laptop runs.
+
+    Remote paths are mapped under `root`. Every request costs one
+    `latency` round trip; with probability `loss` a packet of it is lost
+    and TCP retransmits after `rto` seconds, and with probability `drop`
+    the connection breaks and the request fails like a real SSH error.
+    """
+
+    def __init__(self, root, latency=0.0, loss=0.0, drop=0.0, rto=0.2, seed=None):
+        self.root = root
+        self.latency = latency
+        self.loss = loss
+        self.drop = drop
+        self.rto = rto
+        self.lock = threading.RLock()
+        self.requests = 0
+        self.bytes_sent = 0
+        self._random = random.Random(seed)
+
+    def _remote(self, local_path):
+        return "/" + os.path.relpath(local_path, self.root)
+
+    def _local(self, path):
+        return os.path.join(self.root, path.lstrip("/"))
+
+    def _round_trip(self):
+        self.requests += 1
+        delay = self.latency
+        while self._random.random() < self.loss:
+            delay += self.rto
+        if self._random.random() < self.drop:
+            time.sleep(delay)
+            raise ConnectionError("connection dropped (injected)")
+        time.sleep(delay)
+
+    def close(self):
+        pass
+
+    def size(self, path):
+        self._round_trip()
+        try:
+            return os.path.getsize(self._local(path))
+        except FileNotFoundError:
+            return None
+
+    def makedirs(self, *folders):
+        self._round_trip()
+        for folder in folders:
+            os.makedirs(self._local(folder), exist_ok=True)
+
+    def read(self, path, offset, length=None):
+        self._round_trip()
+        with open(self._local(path), "rb") as f:
+            f.seek(offset)
+            return f.read(length) if length is not None else f.read()
+
+    def append(self, path, data):
+        self._round_trip()
+        self.bytes_sent += len(data)
+        with open(self._local(path), "ab") as f:
+            f.write(data)
+
+    def write(self, path, data):
+        self._round_trip()
+        self.bytes_sent += len(data)
+        local = self._local(path)
+        with open(local + ".tmp", "wb") as f:
+            f.write(data)
+        os.replace(local + ".tmp", local)
+
+    def upload(self, local_path, path):
+        self._round_trip()
+        with open(local_path, "rb") as src, open(self._local(path), "wb") as dst:
+            data = src.read()
+            dst.write(data)
+        self.bytes_sent += len(data)
+
+    def follow(self, path):
+        self._round_trip()
+        return _LocalFollower(self, self._local(path))
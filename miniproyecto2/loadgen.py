@@ -0,0 +1,146 @@
+import time, random, argparse, threading
+from datetime import datetime
+from transport import FileTransport, join_host
+
+HOST_FOLDER = "host_folder"
+GAMES_PER_PLAYER = 6  # R1 + R2, three games each
+
+
+# ---------- Stats ----------
+def percentile(values, p):
+    if not values:
+        return float("nan")
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, int(round(p / 100 * len(ordered))) - 1))
+    return ordered[index]
+
+def summarize(name, values):
+    ms = [v * 1000 for v in values]
+    return (f"{name:<22} n={len(ms):<6} p50={percentile(ms, 50):8.2f}ms  p90={percentile(ms, 90):8.2f}ms  "
+            f"p99={percentile(ms, 99):8.2f}ms  max={max(ms, default=float('nan')):8.2f}ms")
+
+class LoadStats:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.join_ack = []        # Join sent -> Ack received
+        self.assign_result = []   # Assign received -> Result sent (includes the simulated game)
+        self.turnaround = []      # Result sent -> next Assign received (host processing)
+        self.games = 0
+        self.sabotages = 0
+        self.failures = 0
+
+    def add(self, name, value):
+        with self._lock:
+            getattr(self, name).append(value)
+
+    def count(self, name, n=1):
+        with self._lock:
+            setattr(self, name, getattr(self, name) + n)
+
+
+# ---------- Synthetic player ----------
+def play(player_id, transport, duration, heartbeat):
+    # Sleeps through the simulated game, sending a heartbeat every `heartbeat` seconds
+    end = time.monotonic() + duration
+    while heartbeat and end - time.monotonic() > heartbeat:
+        time.sleep(heartbeat)
+        transport.send("heartbeat", player_id, {"PlayerID": player_id, "Action": "Heartbeat",
+                                                "timestamp": datetime.now().isoformat()})
+    time.sleep(max(0, end - time.monotonic()))
+
+def simulated_player(player_id, spec, shared, stats, games, game_time, jitter, timeout, heartbeat=0):
+    transport = shared
+    try:
+        sent = time.perf_counter()
+        join = {"PlayerID": player_id, "Action": "Join", "timestamp": datetime.now().isoformat()}
+        transport, ack = join_host(spec, player_id, join, timeout, transport=shared)
+        if ack is None:
+            raise TimeoutError("no Ack")
+        stats.add("join_ack", time.perf_counter() - sent)
+
+        result_sent = None
+        for _ in range(games):
+            assignment = transport.recv("assign", player_id, timeout)
+            if assignment is None:
+                raise TimeoutError("no Assign")
+            received = time.perf_counter()
+            if result_sent is not None:
+                stats.add("turnaround", received - result_sent)
+            while transport.recv("sabotage", player_id, 0) is not None:
+                stats.count("sabotages")
+
+            play(player_id, transport, max(0, game_time + random.uniform(-jitter, jitter)), heartbeat)
+            transport.send("result", player_id, {
+                "PlayerID": player_id,
+                "stage": assignment["stage"],
+                "GameName": assignment["GameName"],
+                "GameID": assignment["GameID"],
+                "Result": random.choice(["Win", "Lose"]),
+                "timestamp": datetime.now().isoformat(),
+            })
+            result_sent = time.perf_counter()
+            stats.add("assign_result", result_sent - received)
+            stats.count("games")
+        while transport.recv("sabotage", player_id, 0.1) is not None:
+            stats.count("sabotages")
+    except Exception as e:
+        stats.count("failures")
+        print(f"[LOADGEN] {player_id} failed: {e}")
+    finally:
+        if transport is not None and not isinstance(transport, FileTransport):
+            transport.close()
+
+
+# ---------- Runner ----------
+def run_load(players, spec="file", folder=HOST_FOLDER, games=GAMES_PER_PLAYER,
+             game_time=1.0, jitter=0.0, ramp=0.0, timeout=60, heartbeat=0):
+    stats = LoadStats()
+    # File mode: every synthetic player shares one folder watcher
+    shared = FileTransport(spec[len("file:"):] or folder) if spec.startswith("file") else None
+    threads = []
+
+    start = time.perf_counter()
+    for i in range(players):
+        player_id = f"SIM{i:04d}"
+        thread = threading.Thread(target=simulated_player, name=player_id, daemon=True,
+                                  args=(player_id, spec, shared, stats, games, game_time, jitter, timeout,
+                                        heartbeat))
+        thread.start()
+        threads.append(thread)
+        if ramp:
+            time.sleep(ramp)
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    if shared is not None:
+        shared.close()
+    return stats, elapsed
+
+def print_report(stats, elapsed, players):
+    print(f"\n===== LOAD REPORT ({players} players, {elapsed:.2f}s) =====")
+    print(summarize("join -> ack", stats.join_ack))
+    print(summarize("assign -> result", stats.assign_result))
+    print(summarize("result -> next assign", stats.turnaround))
+    print(f"games completed: {stats.games}  ({stats.games / elapsed:.1f} games/s)")
+    print(f"sabotages seen: {stats.sabotages}  failed players: {stats.failures}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Simulated players for load-testing host.py")
+    parser.add_argument("--players", type=int, default=10)
+    parser.add_argument("--transport", default="tcp://127.0.0.1:5555",
+                        help="tcp://127.0.0.1:5555 (default, host.py's default), file, file:<folder>, "
+                             "unix:/path/host.sock or tcp://host:port")
+    parser.add_argument("--games", type=int, default=GAMES_PER_PLAYER, help="games per player")
+    parser.add_argument("--game-time", type=float, default=1.0, help="simulated seconds per game")
+    parser.add_argument("--jitter", type=float, default=0.0, help="± random seconds added to each game")
+    parser.add_argument("--ramp", type=float, default=0.0, help="seconds between player starts")
+    parser.add_argument("--heartbeat", type=float, default=0, help="seconds between heartbeats (0 = none)")
+    parser.add_argument("--timeout", type=float, default=60, help="seconds to wait for any host message")
+    args = parser.parse_args()
+
+    stats, elapsed = run_load(args.players, args.transport, games=args.games, game_time=args.game_time,
+                              jitter=args.jitter, ramp=args.ramp, timeout=args.timeout,
+                              heartbeat=args.heartbeat)
+    print_report(stats, elapsed, args.players)
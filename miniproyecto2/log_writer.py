@@ -0,0 +1,164 @@
+import os, json, time, queue, threading
+
+FLUSH_INTERVAL = 0.2  # seconds
+MAX_QUEUE = 10000
+MAX_BATCH = 1000
+WRITE_ATTEMPTS = 3    # per batch, reopening the sink after each failure
+RETRY_DELAY = 0.5     # seconds between attempts
+
+
+class _Flush:
+    def __init__(self, sync):
+        self.sync = sync
+        self.done = threading.Event()
+
+_STOP = object()
+
+def _is_control(item):
+    return item is _STOP or isinstance(item, _Flush)
+
+
+# ---------- Batched writer ----------
+class BatchedLogWriter:
+    """Appends lines to `path` from a background thread.
+
+    Lines queued within one flush interval go out in a single write(). With
+    `fsync=True` every batch is fsync'd once (group commit), so many events
+    share the cost of one disk sync. The queue is bounded: producers block
+    when the disk can't keep up instead of growing memory without limit.
+    """
+
+    def __init__(self, path, flush_interval=FLUSH_INTERVAL, max_queue=MAX_QUEUE, fsync=False):
+        self.path = path
+        self.flush_interval = flush_interval
+        self.fsync = fsync
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._thread = None
+        self._start_lock = threading.Lock()
+        self._lock = threading.Lock()  # _closed and what gets queued after it
+        self._closed = False
+
+    def _ensure_started(self):
+        if self._thread is None:
+            with self._start_lock:
+                if self._thread is None:
+                    folder = os.path.dirname(self.path)
+                    if folder:
+                        os.makedirs(folder, exist_ok=True)
+                    self._thread = threading.Thread(target=self._run, name="log-writer", daemon=True)
+                    self._thread.start()
+
+    def write(self, line):
+        with self._lock:
+            if not self._closed:
+                self._ensure_started()
+                self._queue.put(line)
+                return
+        # Late events from sessions still shutting down: write them directly
+        sink = self._open_sink()
+        try:
+            self._write_batch(sink, [line])
+        finally:
+            self._close_sink(sink)
+
+    def write_event(self, event):
+        self.write(json.dumps(event, ensure_ascii=False) + "\n")
+
+    def flush(self, sync=None, timeout=None):
+        """Waits until every line queued so far is written (and fsync'd if `sync`)."""
+        with self._lock:
+            if self._thread is None or self._closed:
+                return True
+            if not self._thread.is_alive():
+                return False
+            request = _Flush(self.fsync if sync is None else sync)
+            self._queue.put(request)
+        return request.done.wait(timeout)
+
+    def close(self, timeout=None):
+        """Writes out everything still queued, fsyncs it and stops the thread."""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            if self._thread is None:
+                return
+            # Nothing can be queued behind these once _closed is set
+            self._queue.put(_Flush(sync=True))
+            self._queue.put(_STOP)
+        self._thread.join(timeout)
+
+    # ---------- Sink (overridden by other backends) ----------
+    def _open_sink(self):
+        return open(self.path, "a", encoding="utf-8")
+
+    def _write_batch(self, f, lines):
+        f.write("".join(lines))
+        f.flush()
+
+    def _sync(self, f):
+        os.fsync(f.fileno())
+
+    def _close_sink(self, f):
+        f.close()
+
+    # ---------- Background thread ----------
+    def _run(self):
+        sink = None
+        try:
+            while True:
+                items, control = self._collect()
+                sink = self._write_with_retry(sink, items, control)
+                if isinstance(control, _Flush):
+                    control.done.set()
+                elif control is _STOP:
+                    return
+        finally:
+            if sink is not None:
+                self._close_sink(sink)
+
+    def _write_with_retry(self, sink, items, control):
+        # A failed write (disk full, locked database, ...) reopens the sink and
+        # tries again; the thread keeps running whatever happens to one batch
+        sync = isinstance(control, _Flush) and control.sync and not self.fsync
+        for attempt in range(1, WRITE_ATTEMPTS + 1):
+            try:
+                if sink is None:
+                    sink = self._open_sink()
+                if items:
+                    self._write_batch(sink, items)
+                    if self.fsync:
+                        self._sync(sink)
+                if sync:
+                    self._sync(sink)
+                return sink
+            except Exception as e:
+                print(f"❌ Log writer ({self.path}): {e} (attempt {attempt}/{WRITE_ATTEMPTS})")
+                if sink is not None:
+                    try:
+                        self._close_sink(sink)
+                    except Exception:
+                        pass
+                    sink = None
+                if attempt < WRITE_ATTEMPTS:
+                    time.sleep(RETRY_DELAY)
+        print(f"❌ Log writer ({self.path}): dropped {len(items)} line(s)")
+        return sink
+
+    def _collect(self):
+        # Block for the first item, then gather whatever arrives during the interval
+        item = self._queue.get()
+        if _is_control(item):
+            return [], item
+        lines = [item]
+        deadline = time.monotonic() + self.flush_interval
+        while len(lines) < MAX_BATCH:
+            remaining = deadline - time.monotonic()
+            try:
+                item = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if _is_control(item):
+                return lines, item
+            lines.append(item)
+        return lines, None
@@ -0,0 +1,50 @@
+# minigames/buttons.py
+
+# -------------------------------------------------------------
+# GPIO push buttons (Raspberry Pi only), shared by every game
+# -------------------------------------------------------------
+_buttons = {}  # pin -> gpiozero Button, or None when GPIO is unavailable
+_virtual = False
+
+
+class VirtualButton:
+    """The part of gpiozero's Button the games use, pressed and released
+    by code instead of by hand (headless runs)."""
+
+    def __init__(self, pin):
+        self.pin = pin
+        self.is_pressed = False
+        self.when_pressed = None
+
+    def press(self):
+        if self.is_pressed:
+            return
+        self.is_pressed = True
+        if self.when_pressed is not None:
+            self.when_pressed()
+
+    def release(self):
+        self.is_pressed = False
+
+
+def use_virtual_buttons():
+    """From now on every game gets VirtualButtons instead of GPIO ones."""
+    global _virtual
+    _virtual = True
+    _buttons.clear()
+
+
+def get_button(pin):
+    """The Button on `pin`, claimed the first time a game asks for it.
+    Several games read the same pin, so they share one Button instead of
+    each creating their own (gpiozero refuses a pin already in use).
+    Returns None when gpiozero or the GPIO hardware is not available."""
+    if pin not in _buttons and _virtual:
+        _buttons[pin] = VirtualButton(pin)
+    elif pin not in _buttons:
+        try:
+            from gpiozero import Button
+            _buttons[pin] = Button(pin)
+        except Exception:
+            _buttons[pin] = None
+    return _buttons[pin]
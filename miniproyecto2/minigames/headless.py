@@ -0,0 +1,215 @@
+# minigames/headless.py
+import os, sys, json, time, random, argparse
+from PyQt6.QtWidgets import QApplication, QLineEdit
+from PyQt6.QtGui import QKeyEvent
+from PyQt6.QtCore import Qt, QEvent, QTimer
+from minigames import registry, shell
+from minigames.shell import get_shell, ms
+from minigames.buttons import get_button, use_virtual_buttons
+
+# Games run on Qt's offscreen platform with a script instead of a player.
+# A script is a list of steps (delay_ms, action, arg); each delay counts from
+# the previous step, in game time. Actions:
+#   "key"        arg: key name ("1", "space", "enter"): press and release it
+#   "key_down"   / "key_up": hold or let go of a key
+#   "press"      arg: GPIO pin: button edge down (a VirtualButton)
+#   "release"    arg: GPIO pin: button edge up
+#   "type"       arg: text typed into the game's answer box, then Enter
+#   "wait"       arg: predicate(game): waits until it is true
+# Apart from "wait", arg may also be a function of the game, called when the
+# step runs (e.g. to read the sequence a MemoryGame is showing).
+
+DEFAULT_SPEED = 10   # game time runs this many times faster than real time
+WAIT_POLL = 20       # game ms between checks of a "wait" predicate
+TIMEOUT_FACTOR = 3   # a game gives up after this many times its usual duration
+
+KEYS = {"space": Qt.Key.Key_Space, "enter": Qt.Key.Key_Return}
+
+_running = set()  # scripts in progress; Qt only holds weak references to them
+
+
+def enable(speed=DEFAULT_SPEED):
+    """Offscreen Qt, virtual GPIO buttons and game time `speed` times faster.
+    Call before anything creates the QApplication."""
+    if QApplication.instance() is None:
+        os.environ["QT_QPA_PLATFORM"] = "offscreen"
+    shell.SPEED = speed
+    use_virtual_buttons()
+
+
+# ---------- Input ----------
+def send_key(widget, name, down=True, up=True):
+    key = KEYS.get(name) or Qt.Key(ord(name.upper()))
+    text = name if len(name) == 1 else ""
+    if down:
+        QApplication.sendEvent(widget, QKeyEvent(QEvent.Type.KeyPress, key, Qt.KeyboardModifier.NoModifier, text))
+    if up:
+        QApplication.sendEvent(widget, QKeyEvent(QEvent.Type.KeyRelease, key, Qt.KeyboardModifier.NoModifier, text))
+
+def type_answer(game, text):
+    box = game.findChild(QLineEdit)
+    box.clear()
+    for char in text:
+        send_key(box, char)
+    send_key(box, "enter")
+
+
+class ScriptedInput:
+    """Plays a script into one game. A game still running after `timeout`
+    game seconds is given up as a Lose, as if its window had been closed."""
+
+    def __init__(self, steps, timeout=None):
+        self.steps = list(steps)
+        self.timeout = timeout
+        self.game = None
+        self.timed_out = False
+        self.held = set()  # pins this script pressed and hasn't released
+        self.timer = QTimer()
+        self.timer.setSingleShot(True)
+        self.timer.timeout.connect(self._step)
+        self.deadline = QTimer()
+        self.deadline.setSingleShot(True)
+        self.deadline.timeout.connect(self._give_up)
+
+    def attach(self, game):
+        if game is None or game.outcome is not None:
+            _running.discard(self)
+            return
+        self.game = game
+        game.finished.connect(self.stop)
+        if self.timeout:
+            self.deadline.start(ms(self.timeout * 1000))
+        self._schedule()
+
+    def stop(self, *_):
+        self.timer.stop()
+        self.deadline.stop()
+        self.steps.clear()
+        for pin in self.held:
+            get_button(pin).release()  # the game may have ended before the release step
+        self.held.clear()
+        _running.discard(self)
+
+    def _schedule(self):
+        if self.steps:
+            self.timer.start(ms(self.steps[0][0]))
+
+    def _step(self):
+        _, action, arg = self.steps[0]
+        if action == "wait":
+            if not arg(self.game):
+                self.timer.start(ms(WAIT_POLL))
+                return
+            self.steps.pop(0)
+        else:
+            self.steps.pop(0)  # before acting: the action may end the game
+            self.perform(action, arg(self.game) if callable(arg) else arg)
+        self._schedule()
+
+    def perform(self, action, arg):
+        if action == "key":
+            send_key(self.game, arg)
+        elif action == "key_down":
+            send_key(self.game, arg, up=False)
+        elif action == "key_up":
+            send_key(self.game, arg, down=False)
+        elif action == "press":
+            self.held.add(arg)
+            get_button(arg).press()
+        elif action == "release":
+            self.held.discard(arg)
+            get_button(arg).release()
+        elif action == "type":
+            type_answer(self.game, arg)
+        else:
+            raise ValueError(f"unknown script action {action!r}")
+
+    def _give_up(self):
+        self.timed_out = True
+        self.game.finish("Lose", 0)
+
+
+# ---------- Scripts ----------
+def autoplay(name, accuracy=1.0, rng=random):
+    """A script for `name` that plays like someone who gets each answer
+    (or button) right with probability `accuracy`."""
+    def right():
+        return rng.random() < accuracy
+
+    if name == "MemoryGame":
+        return [(rng.uniform(300, 900), "type",
+                 lambda g, ok=right(): g.sequence if ok else g.sequence[::-1] + "X")
+                for _ in range(5)]
+
+    if name == "EquationGame":
+        return [(rng.uniform(1000, 4000), "type",
+                 lambda g, ok=right(): str(g.solution if ok else g.solution + 1))
+                for _ in range(3)]
+
+    if name == "ReactionGame":
+        from minigames.juego_colores import BUTTON_PINS
+        steps = []
+        for i in range(3):
+            def pin(g, ok=right()):
+                colors = [c for c in BUTTON_PINS if (c == g.current_color) == ok]
+                return BUTTON_PINS[colors[0]]
+            prompted = lambda g, i=i: len(g.scores) == i and g.current_color and not g.prompt_timer.isActive()
+            steps += [(0, "wait", prompted), (rng.uniform(250, 700), "press", pin), (50, "release", pin)]
+        return steps
+
+    if name == "BalloonGame":
+        from minigames.juego_globos import BUTTON_PIN
+        return [(0, "press", BUTTON_PIN)]  # holds the button the whole game
+
+    raise KeyError(name)
+
+
+# ---------- Running ----------
+def drive_next(name, script=None, accuracy=1.0, rng=random, timeout=None):
+    """Feeds `script` (autoplay by default) to the next game the shell runs.
+    Call right before GameShell.run(); returns the ScriptedInput."""
+    if timeout is None:
+        timeout = TIMEOUT_FACTOR * registry.entry(name).duration
+    driver = ScriptedInput(autoplay(name, accuracy, rng) if script is None else script, timeout)
+    _running.add(driver)
+    QTimer.singleShot(0, lambda: driver.attach(get_shell().current))
+    return driver
+
+def run_headless(name, script=None, accuracy=1.0, rng=random, timeout=None):
+    """Plays one game without a player, after enable(). Returns its outcome
+    dict, the same {"Result", "Score"} as an interactive run.
+    Raises TimeoutError if the script never got the game to its end."""
+    driver = drive_next(name, script, accuracy, rng, timeout)
+    outcome = get_shell().run(registry.load(name)())
+    if driver.timed_out:
+        raise TimeoutError(f"{name} did not finish within {driver.timeout}s of game time")
+    return outcome
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Plays minigames offscreen with scripted input; "
+                                                 "prints one JSON line per game")
+    parser.add_argument("games", nargs="*", help=f"games to play (default: all of {', '.join(registry.names())})")
+    parser.add_argument("--count", type=int, default=1, help="times to play each game")
+    parser.add_argument("--speed", type=float, default=DEFAULT_SPEED, help="game time / real time")
+    parser.add_argument("--accuracy", type=float, default=0.8, help="chance each scripted answer is right")
+    parser.add_argument("--seed", type=int)
+    args = parser.parse_args()
+
+    enable(args.speed)
+    rng = random.Random(args.seed)
+    start = time.perf_counter()
+    played = 0
+    for _ in range(args.count):
+        for name in args.games or registry.names():
+            t = time.perf_counter()
+            try:
+                outcome = run_headless(name, accuracy=args.accuracy, rng=rng)
+            except TimeoutError as e:
+                print(f"❌ {e}", file=sys.stderr)
+                continue
+            print(json.dumps({"GameName": name, **outcome, "Seconds": round(time.perf_counter() - t, 3)}))
+            played += 1
+
+    elapsed = time.perf_counter() - start
+    print(f"{played} games in {elapsed:.1f}s → {played / elapsed * 3600:.0f} games/hour", file=sys.stderr)
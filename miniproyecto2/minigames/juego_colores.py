@@ -1,51 +1,43 @@
 # minigames/reaction_game.py
-import sys
 import random
-import time
+import warnings
 
-from PyQt6.QtWidgets import QApplication, QWidget, QLabel, QVBoxLayout
+from PyQt6.QtWidgets import QLabel, QVBoxLayout
 from PyQt6.QtCore import QTimer, Qt
+from minigames.shell import Minigame, get_shell, ms, now
+from minigames.buttons import get_button
 
 # -------------------------------------------------------------
 # Optional GPIO Support (Raspberry Pi Only)
 # -------------------------------------------------------------
-USE_GPIO = False
-try:
-    from gpiozero import Button
-    button_black = Button(27)
-    button_blue  = Button(18)
-    button_red   = Button(17)
-    USE_GPIO = True
-except Exception:
-    # GPIO not available → fallback to keyboard input
-    button_black = None
-    button_blue = None
-    button_red = None
+BUTTON_PINS = {"Black": 27, "Blue": 18, "Red": 17}
+
+
+def gpio_buttons():
+    """Color -> Button, claimed when a game starts rather than at import.
+    None if GPIO is not available → fallback to keyboard input."""
+    buttons = {color: get_button(pin) for color, pin in BUTTON_PINS.items()}
+    return buttons if all(buttons.values()) else None
 
 
 # -------------------------------------------------------------
 # Reaction Game Class
 # -------------------------------------------------------------
-class ReactionGame(QWidget):
+class ReactionGame(Minigame):
     def __init__(self):
         super().__init__()
 
         self.setWindowTitle("Reaction Game")
         self.setGeometry(200, 200, 400, 200)
 
-        # Game state
         self.colors = ["Black", "Blue", "Red"]
-        self.current_color = None
-        self.reaction_times = []
-        self.scores = []
         self.max_clicks = 3
-        self.clicks_done = 0
-        self.start_time = 0
+        self.buttons = None  # bound by setup_input() when GPIO is available
 
         # GUI
         self.layout = QVBoxLayout()
 
-        self.label = QLabel("Press the correct button!")
+        self.label = QLabel()
         self.label.setStyleSheet("font-size: 16px;")
         self.layout.addWidget(self.label, alignment=Qt.AlignmentFlag.AlignCenter)
 
@@ -53,31 +45,67 @@ class ReactionGame(QWidget):
         self.result_label.setStyleSheet("font-size: 14px;")
         self.layout.addWidget(self.result_label, alignment=Qt.AlignmentFlag.AlignCenter)
 
-        self.score_label = QLabel("Score: 0")
+        self.score_label = QLabel()
         self.score_label.setStyleSheet("font-size: 14px; color: green;")
         self.layout.addWidget(self.score_label, alignment=Qt.AlignmentFlag.AlignCenter)
 
         self.setLayout(self.layout)
 
+        # Delay before each color is requested
+        self.prompt_timer = QTimer()
+        self.prompt_timer.setSingleShot(True)
+        self.prompt_timer.timeout.connect(self.show_button)
+
+        self.reset()
+
+    def reset(self):
+        super().reset()
+        self.prompt_timer.stop()
+        self.release_input()
+
+        # Game state
+        self.current_color = None
+        self.reaction_times = []
+        self.scores = []
+        self.clicks_done = 0
+        self.start_time = 0
+
+        self.label.setText("Press the correct button!")
+        self.result_label.setText("")
+        self.score_label.setText("Score: 0")
+
+    def start(self):
         # Bind GPIO or keyboard
         self.setup_input()
 
         # Start game after 1 second
-        QTimer.singleShot(1000, self.show_button)
+        self.prompt_timer.start(ms(1000))
 
     # ---------------------------------------------------------
     # Input Handling (GPIO or keyboard)
     # ---------------------------------------------------------
     def setup_input(self):
-        if USE_GPIO:
-            button_black.when_pressed = lambda: self.button_pressed("Black")
-            button_blue.when_pressed  = lambda: self.button_pressed("Blue")
-            button_red.when_pressed   = lambda: self.button_pressed("Red")
+        self.buttons = gpio_buttons()
+        if self.buttons:
+            for color, button in self.buttons.items():
+                button.when_pressed = lambda color=color: self.button_pressed(color)
         else:
             self.label.setText("Press 1=Black, 2=Blue, 3=Red when requested.")
 
+    def release_input(self):
+        """Unbinds the GPIO buttons, so a waiting instance ignores presses."""
+        if self.buttons:
+            with warnings.catch_warnings():
+                warnings.filterwarnings("ignore", "The callback was set to None")
+                for button in self.buttons.values():
+                    button.when_pressed = None
+
+    def finish(self, result, score=None):
+        self.release_input()  # however the game ends, even with the window closed
+        super().finish(result, score)
+
     def keyPressEvent(self, event):
-        if USE_GPIO:
+        if self.buttons:
             return  # ignore keyboard on Pi
 
         if event.key() == Qt.Key.Key_1:
@@ -97,13 +125,13 @@ class ReactionGame(QWidget):
         self.current_color = random.choice(self.colors)
         self.label.setText(f"Press: {self.current_color}")
 
-        self.start_time = time.time()
+        self.start_time = now()
 
     def button_pressed(self, color):
         if self.clicks_done >= self.max_clicks:
             return
 
-        reaction_time = time.time() - self.start_time
+        reaction_time = now() - self.start_time
 
         # Scoring Logic (same as original)
         base_score = 34 if self.clicks_done == 2 else 33
@@ -125,7 +153,7 @@ class ReactionGame(QWidget):
 
         if self.clicks_done < self.max_clicks:
             wait_time = random.uniform(2, 5) * 1000
-            QTimer.singleShot(int(wait_time), self.show_button)
+            self.prompt_timer.start(ms(wait_time))
         else:
             self.finish_game()
 
@@ -141,7 +169,8 @@ class ReactionGame(QWidget):
         self.result_label.setText(f"{results}\n\nTotal Score: {total_score}/100")
 
         self.label.setText("Game Finished!")
-        self.score = total_score  # stored so run_reaction_game() can retrieve it
+        self.score = total_score
+        self.finish_later("Win", total_score)
 
 
 # -------------------------------------------------------------
@@ -149,19 +178,10 @@ class ReactionGame(QWidget):
 # -------------------------------------------------------------
 def run_reaction_game():
     """
-    Launches the Reaction Game GUI and waits for completion.
+    Runs the Reaction Game in the shared shell window and waits for completion.
     Returns a dict with the result and the score.
     """
-
-    app = QApplication(sys.argv)
-    window = ReactionGame()
-    window.show()
-    app.exec()  # This blocks until window is closed
-
-    return {
-        "Result": "Win",
-        "Score": window.score
-    }
+    return get_shell().run(ReactionGame())
 
 # run standalone for testing
 if __name__ == "__main__":
@@ -1,13 +1,12 @@
-import sys
 import random
-import time
 from PyQt6.QtWidgets import (
-    QApplication, QWidget, QLabel, QLineEdit, QPushButton, QVBoxLayout
+    QLabel, QLineEdit, QPushButton, QVBoxLayout
 )
 from PyQt6.QtCore import Qt, QTimer
+from minigames.shell import Minigame, get_shell, ms, now
 
 
-class EquationGame(QWidget):
+class EquationGame(Minigame):
     def __init__(self):
         super().__init__()
         self.setWindowTitle("Equation Solver Game")
@@ -27,6 +26,7 @@ class EquationGame(QWidget):
         self.answer_input = QLineEdit()
         self.answer_input.setPlaceholderText("Enter your answer")
         self.answer_input.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        self.answer_input.returnPressed.connect(self.check_answer)
         layout.addWidget(self.answer_input)
 
         self.submit_button = QPushButton("Submit")
@@ -35,10 +35,9 @@ class EquationGame(QWidget):
         layout.addWidget(self.submit_button, alignment=Qt.AlignmentFlag.AlignCenter)
 
         self.result_label = QLabel("")
-        self.result_label.setStyleSheet("font-size: 16px; color: green;")
         layout.addWidget(self.result_label, alignment=Qt.AlignmentFlag.AlignCenter)
 
-        self.timer_label = QLabel("Time: 15s")
+        self.timer_label = QLabel()
         self.timer_label.setStyleSheet("font-size: 18px; color: red;")
         layout.addWidget(self.timer_label, alignment=Qt.AlignmentFlag.AlignCenter)
 
@@ -48,17 +47,35 @@ class EquationGame(QWidget):
 
         self.setLayout(layout)
 
+        self.timer = QTimer()
+        self.timer.timeout.connect(self.update_timer)
+
+        self.reset()
+
+    def reset(self):
+        """Back to the state before start(): full score and time, no equation."""
+        super().reset()
+        self.timer.stop()
+
         # --- Game Variables ---
         self.score = 100
         self.time_left = 15
-        self.start_time = time.time()
-        self.timer = QTimer()
-        self.timer.timeout.connect(self.update_timer)
-        self.timer.start(1000)
+        self.start_time = now()
+        self.done = False  # indicates when game ends
 
-        self.finished = False  # indicates when game ends
+        self.equation_label.setText("")
+        self.answer_input.clear()
+        self.answer_input.setEnabled(True)
+        self.submit_button.setEnabled(True)
+        self.result_label.setText("")
+        self.result_label.setStyleSheet("font-size: 16px; color: green;")
+        self.timer_label.setText(f"Time: {self.time_left}s")
+        self.score_label.setText("")
 
-        # --- Start game ---
+    def start(self):
+        """Starts the clock and shows the first equation."""
+        self.start_time = now()
+        self.timer.start(ms(1000))
         self.generate_equation()
 
     def generate_equation(self):
@@ -75,7 +92,7 @@ class EquationGame(QWidget):
 
     def check_answer(self):
         """Check if user’s answer is correct"""
-        if self.time_left <= 0 or self.finished:
+        if self.time_left <= 0 or self.done:
             return
 
         try:
@@ -86,7 +103,7 @@ class EquationGame(QWidget):
             return
 
         if user_answer == self.solution:
-            elapsed = int(time.time() - self.start_time)
+            elapsed = int(now() - self.start_time)
             if elapsed >= 6:
                 self.score = max(0, 100 - (elapsed - 5) * 10)
 
@@ -103,8 +120,8 @@ class EquationGame(QWidget):
             self.finish_game(correct=False)
 
     def finish_game(self, correct):
-        """Ends game and closes after short delay"""
-        self.finished = True
+        """Ends game and reports the score after a short delay"""
+        self.done = True
         self.timer.stop()
         self.submit_button.setEnabled(False)
         self.answer_input.setEnabled(False)
@@ -121,19 +138,13 @@ class EquationGame(QWidget):
         self.timer_label.setText("Time: 0s")
         self.score_label.setText(f"Final Score: {self.score}")
 
-        # Auto-close window after 2 seconds
-        QTimer.singleShot(2000, self.close)
+        # Report after 2 seconds
+        self.finish_later("Win" if self.score > 0 else "Lose", self.score)
 
 
 def run_equation_game():
     """Runs the game and returns final score (blocking until finished)."""
-    app = QApplication(sys.argv)
-    game = EquationGame()
-
-    game.show()
-    app.exec()
-
-    return game.score
+    return get_shell().run(EquationGame())["Score"]
 
 
 # Run standalone for testing
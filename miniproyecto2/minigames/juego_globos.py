@@ -1,13 +1,13 @@
 #!/usr/bin/env python3
-import sys
 import random
 from PyQt6.QtCore import Qt, QTimer, QRect
 from PyQt6.QtGui import QColor, QPainter
-from PyQt6.QtWidgets import QApplication, QWidget
-from gpiozero import Button
+from minigames.shell import Minigame, get_shell, ms
+from minigames.buttons import get_button
 
 # ---------------- Hardware ----------------
-button = Button(17)
+# Claimed when the game starts; without GPIO the space bar is the button
+BUTTON_PIN = 17
 
 # ---------------- Constantes ----------------
 SCREEN_WIDTH = 600
@@ -31,53 +31,82 @@ class Balloon:
         return QRect(int(self.x), int(self.y), self.size, self.size)
 
 # ---------------- Juego ----------------
-class BalloonGame(QWidget):
+class BalloonGame(Minigame):
     def __init__(self):
         super().__init__()
         self.setWindowTitle("Balloon Game")
         self.setFixedSize(SCREEN_WIDTH, SCREEN_HEIGHT)
-
-        self.cursor_x = SCREEN_WIDTH/2 - CURSOR_SIZE/2
-        self.cursor_y = SCREEN_HEIGHT/2 - CURSOR_SIZE/2
-        self.balloons = []
-        self.spawn_interval = BALLOON_SPAWN_START
-        self.running = True
-        self.result_value = None
+        self.button = None
+        self.space_down = False
 
         # Timer de actualización
         self.timer_update = QTimer()
         self.timer_update.timeout.connect(self.update_game)
-        self.timer_update.start(16)  # 60 FPS
 
         # Timer de spawn de globos
         self.timer_spawn = QTimer()
         self.timer_spawn.timeout.connect(self.spawn_balloon)
-        self.timer_spawn.start(self.spawn_interval)
 
         # Timer de fin de juego
         self.timer_game = QTimer()
         self.timer_game.setSingleShot(True)
         self.timer_game.timeout.connect(self.game_over)
-        self.timer_game.start(GAME_DURATION)
+
+        self.reset()
+
+    def reset(self):
+        super().reset()
+        self.stop_timers()
+        self.cursor_x = SCREEN_WIDTH/2 - CURSOR_SIZE/2
+        self.cursor_y = SCREEN_HEIGHT/2 - CURSOR_SIZE/2
+        self.balloons = []
+        self.spawn_interval = BALLOON_SPAWN_START
+        self.running = False
+        self.result_value = None
+        self.popped = 0
+        self.space_down = False
+        self.update()
+
+    def stop_timers(self):
+        for timer in (self.timer_update, self.timer_spawn, self.timer_game):
+            timer.stop()
+
+    def start(self):
+        self.button = get_button(BUTTON_PIN)
+        self.running = True
+        self.timer_update.start(ms(16))  # 60 FPS
+        self.timer_spawn.start(ms(self.spawn_interval))
+        self.timer_game.start(ms(GAME_DURATION))
 
     def update_game(self):
         if not self.running:
             return
         for b in self.balloons:
             b.move()
-        if button.is_pressed:
+        if self.pressed():
             self.check_collisions()
         for b in self.balloons:
             if b.y > SCREEN_HEIGHT:
-                self.running = False
-                self.result_value = "Lose"
-                self.update()
+                self.end("Lose")
                 return
         self.update()
 
+    def pressed(self):
+        return self.button.is_pressed if self.button is not None else self.space_down
+
+    def keyPressEvent(self, event):
+        if event.key() == Qt.Key.Key_Space and not event.isAutoRepeat():
+            self.space_down = True
+
+    def keyReleaseEvent(self, event):
+        if event.key() == Qt.Key.Key_Space and not event.isAutoRepeat():
+            self.space_down = False
+
     def check_collisions(self):
         cursor_rect = QRect(int(self.cursor_x), int(self.cursor_y), CURSOR_SIZE, CURSOR_SIZE)
-        self.balloons = [b for b in self.balloons if not cursor_rect.intersects(b.rect())]
+        remaining = [b for b in self.balloons if not cursor_rect.intersects(b.rect())]
+        self.popped += len(self.balloons) - len(remaining)
+        self.balloons = remaining
 
     def spawn_balloon(self):
         x = random.randint(20, SCREEN_WIDTH - 60)
@@ -85,12 +114,17 @@ class BalloonGame(QWidget):
         self.balloons.append(Balloon(x, QColor(color)))
         if self.spawn_interval > BALLOON_SPAWN_MIN:
             self.spawn_interval -= 20
-            self.timer_spawn.start(self.spawn_interval)
+            self.timer_spawn.start(ms(self.spawn_interval))
 
     def game_over(self):
+        self.end("Win" if len(self.balloons)==0 else "Lose")
+
+    def end(self, result):
         self.running = False
-        self.result_value = "Win" if len(self.balloons)==0 else "Lose"
+        self.result_value = result
+        self.stop_timers()
         self.update()
+        self.finish_later(result, self.popped)
 
     def paintEvent(self, event):
         painter = QPainter(self)
@@ -104,17 +138,19 @@ class BalloonGame(QWidget):
         painter.setBrush(QColor("white"))
         painter.drawRect(int(self.cursor_x), int(self.cursor_y), CURSOR_SIZE, CURSOR_SIZE)
 
-        if not self.running:
+        if self.result_value is not None:
             painter.setPen(QColor("white"))
             painter.drawText(self.rect(), Qt.AlignmentFlag.AlignCenter,
                              "WIN" if self.result_value=="Win" else "LOSE")
 
+# ---------------- Lanzador ----------------
+def run_balloon_game():
+    """Runs one game in the shared shell window. Returns True on a win."""
+    return get_shell().run(BalloonGame())["Result"] == "Win"
+
 # ---------------- Main ----------------
 if __name__ == "__main__":
-    app = QApplication(sys.argv)
-    game_win = BalloonGame()
-    game_win.show()
-    app.exec()
+    run_balloon_game()
 
 
 
@@ -1,9 +1,10 @@
 # minigames/memory_game.py
 
-import sys, random, string, json, time, os
+import random, string, json, time, os
 from datetime import datetime
-from PyQt6.QtWidgets import QApplication, QWidget, QVBoxLayout, QLabel, QLineEdit, QPushButton, QMessageBox
+from PyQt6.QtWidgets import QVBoxLayout, QLabel, QLineEdit, QPushButton
 from PyQt6.QtCore import QTimer, Qt
+from minigames.shell import Minigame, get_shell, ms
 
 # ---------- Logging ----------
 def log_event(player_id, game_name, event_type, result, extra_data=None):
@@ -20,22 +21,17 @@ def log_event(player_id, game_name, event_type, result, extra_data=None):
         file.write(json.dumps(event, ensure_ascii=False) + "\n")
 
 # ---------- Memory Game ----------
-class MemoryGame(QWidget):
+class MemoryGame(Minigame):
     def __init__(self, player_id="P001"):
         super().__init__()
         self.player_id = player_id
-        self.sequence = ""
         self.level = 4
-        self.round = 0
-        self.points = 0
-        self.time_left = 15
-        self.game_active = False
 
         self.setWindowTitle("Memory Game")
         self.setGeometry(500, 200, 400, 300)
 
         layout = QVBoxLayout()
-        self.timer_label = QLabel(f"Time: {self.time_left}")
+        self.timer_label = QLabel()
         self.timer_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
         self.timer_label.setStyleSheet("font-size: 20px; font-weight: bold;")
         layout.addWidget(self.timer_label)
@@ -69,6 +65,26 @@ class MemoryGame(QWidget):
         self.hide_timer.setSingleShot(True)
         self.hide_timer.timeout.connect(self.hide_sequence)
 
+        self.reset()
+
+    def reset(self):
+        super().reset()
+        self.main_timer.stop()
+        self.hide_timer.stop()
+        self.sequence = ""
+        self.round = 0
+        self.points = 0
+        self.time_left = 15
+        self.game_active = False
+        self.timer_label.setText(f"Time: {self.time_left}")
+        self.seq_label.setText("")
+        self.input_box.clear()
+        self.start_button.setEnabled(True)
+        self.submit_button.setEnabled(False)
+
+    def start(self):
+        self.start_game()
+
     def start_game(self):
         self.start_button.setEnabled(False)
         self.submit_button.setEnabled(True)
@@ -80,7 +96,7 @@ class MemoryGame(QWidget):
         self.timer_label.setText(f"Time: {self.time_left}")
         self.seq_label.setText("")
         self.input_box.clear()
-        self.main_timer.start(1000)
+        self.main_timer.start(ms(1000))
         log_event(self.player_id, "MemoryGame", "GameStart", "Started", {"initial_level": self.level})
         self.next_round()
 
@@ -98,7 +114,7 @@ class MemoryGame(QWidget):
         self.generate_sequence()
         self.seq_label.setText(self.sequence)
         self.input_box.clear()
-        self.hide_timer.start(1000)
+        self.hide_timer.start(ms(1000))
         log_event(self.player_id, "MemoryGame", "RoundStart", "ShownSequence", {"round": self.round + 1, "sequence": self.sequence})
 
     def hide_sequence(self):
@@ -132,29 +148,17 @@ class MemoryGame(QWidget):
         if not self.game_active:
             return
         self.main_timer.stop()
+        self.hide_timer.stop()  # would blank the result below
+        # Start stays disabled until reset(): this game has already reported
         self.submit_button.setEnabled(False)
-        self.start_button.setEnabled(True)
         self.game_active = False
         log_event(self.player_id, "MemoryGame", "GameEnd", "Finished", {"final_round": self.round, "final_points": self.points})
-        msg = QMessageBox()
-        msg.setWindowTitle("Game Over")
-        msg.setText(f"Game Over!\nRounds: {self.round}\nPoints: {self.points}/100")
-        msg.exec()
-        self.sequence = ""
-        self.round = 0
-        self.points = 0
-        self.time_left = 15
-        self.timer_label.setText(f"Time: {self.time_left}")
-        self.seq_label.setText("")
+        self.seq_label.setText(f"Game Over!\nRounds: {self.round}\nPoints: {self.points}/100")
         self.input_box.clear()
         self.submit_button.setEnabled(False)
+        self.finish_later("Win" if self.points >= 60 else "Lose", self.points)
 
 # ---------- Game launcher ----------
 def play_memory_game():
-    """Function used by main player code to launch this game."""
-    app = QApplication(sys.argv)
-    window = MemoryGame()
-    window.show()
-    app.exec()
-    # Return a dummy result for host
-    return "Win" if window.points >= 60 else "Lose"
+    """Runs one game in the shared shell window. Returns "Win" or "Lose"."""
+    return get_shell().run(MemoryGame())["Result"]
@@ -0,0 +1,57 @@
+# minigames/pool.py
+from minigames.shell import get_shell
+
+
+class GamePool:
+    """Keeps one ready instance of each game, built ahead of time and hidden.
+
+    prepare() builds (and paints once, off screen) the instance a round
+    will need; play() swaps it into the shell, and once the game is over
+    resets it and keeps it for the next time that game comes up. Qt widgets
+    live on the main thread, so prepare() is meant to be called from the
+    idle time between rounds, one game at a time.
+    """
+
+    def __init__(self, load):
+        self.load = load  # game name -> Minigame subclass (KeyError if unknown)
+        self.idle = {}  # game name -> ready, reset instance
+
+    def __contains__(self, name):
+        return name in self.idle
+
+    def prepare(self, name):
+        """Builds `name` now unless an instance is already waiting."""
+        if name in self.idle:
+            return False
+        try:
+            game_class = self.load(name)
+        except KeyError:
+            return False
+        game = game_class()
+        game.grab()  # polish + one full paint, without showing a window
+        self.idle[name] = game
+        return True
+
+    def take(self, name):
+        game = self.idle.pop(name, None)
+        return game if game is not None else self.load(name)()
+
+    def release(self, name, game):
+        game.reset()
+        if name in self.idle:
+            game.deleteLater()  # one spare per game is enough
+        else:
+            self.idle[name] = game
+
+    def play(self, name):
+        """Plays `name` in the shell window. Returns its outcome dict."""
+        game = self.take(name)
+        try:
+            return get_shell().run(game, keep=True)
+        finally:
+            self.release(name, game)
+
+    def clear(self):
+        for game in self.idle.values():
+            game.deleteLater()
+        self.idle.clear()
@@ -0,0 +1,69 @@
+# minigames/registry.py
+import importlib
+
+# -------------------------------------------------------------
+# Minigame registry
+# -------------------------------------------------------------
+# Game name (as used by the host) -> where the game lives and what it needs.
+# Nothing here imports PyQt6 or gpiozero: a game's module is only imported
+# the first time the game is loaded, i.e. when it is first scheduled.
+
+
+class GameEntry:
+    """One minigame: its lazily imported class plus metadata.
+
+    duration: seconds a game usually takes, without the final screen
+    inputs:   what the player plays it with, preferred first
+              ("gpio" falls back to "keyboard" when there is no GPIO)
+    pins:     GPIO pins it reads, if any
+    """
+
+    def __init__(self, name, module, attr, duration, inputs, pins=()):
+        self.name = name
+        self.module = module
+        self.attr = attr
+        self.duration = duration
+        self.inputs = tuple(inputs)
+        self.pins = tuple(pins)
+        self._class = None
+
+    @property
+    def loaded(self):
+        return self._class is not None
+
+    def load(self):
+        """Imports the game's module (first call only) and returns its class."""
+        if self._class is None:
+            self._class = getattr(importlib.import_module(self.module), self.attr)
+        return self._class
+
+    def describe(self):
+        return f"{self.name} (~{self.duration}s, {' or '.join(self.inputs)})"
+
+
+REGISTRY = {}
+
+
+def register(name, module, attr, duration, inputs, pins=()):
+    REGISTRY[name] = GameEntry(name, module, attr, duration, inputs, pins)
+
+
+def names():
+    return list(REGISTRY)
+
+
+def entry(name):
+    return REGISTRY[name]
+
+
+def load(name):
+    """Class of the game called `name`; KeyError for unknown games."""
+    return REGISTRY[name].load()
+
+
+register("MemoryGame",   "minigames.memory_game",    "MemoryGame",   duration=15, inputs=["keyboard"])
+register("EquationGame", "minigames.juego_ecuacion", "EquationGame", duration=15, inputs=["keyboard"])
+register("ReactionGame", "minigames.juego_colores",  "ReactionGame", duration=10, inputs=["gpio", "keyboard"],
+         pins=[27, 18, 17])
+register("BalloonGame",  "minigames.juego_globos",   "BalloonGame",  duration=10, inputs=["gpio", "keyboard"],
+         pins=[17])
@@ -0,0 +1,133 @@
+# minigames/shell.py
+import sys, time
+from PyQt6.QtWidgets import QApplication, QWidget, QLabel, QStackedWidget, QVBoxLayout
+from PyQt6.QtCore import Qt, QEventLoop, QTimer, pyqtSignal
+
+RESULT_DELAY = 2000  # ms the final screen of a game stays up before it reports
+
+# Game speed. Headless runs (minigames/headless.py) raise it to play faster
+# than real time: games start every timer with ms() and read the clock with
+# now(), so timings and reaction scores stay consistent at any speed.
+SPEED = 1
+
+
+def ms(interval):
+    """Real milliseconds for a game interval of `interval` ms."""
+    return max(1, int(interval / SPEED))
+
+def now():
+    """Game clock in seconds; time.time() at normal speed."""
+    return time.time() * SPEED
+
+
+# ---------- Common game interface ----------
+class Minigame(QWidget):
+    """Base of every minigame page.
+
+    start() begins a game; when it is over the game emits `finished` once
+    with {"Result": "Win" | "Lose", "Score": int or None}. Games never close
+    their window or quit the application themselves.
+
+    reset() puts a played (or half-played) game back to its just-built
+    state, so one instance can be played again instead of rebuilt.
+    Subclasses call super().reset() and keep every timer they start as
+    an attribute, so that reset() can stop it.
+    """
+    finished = pyqtSignal(dict)
+
+    def __init__(self):
+        super().__init__()
+        self.setFocusPolicy(Qt.FocusPolicy.StrongFocus)
+        self.outcome = None
+        self.report = None  # (result, score) waiting for report_timer
+        self.report_timer = QTimer()
+        self.report_timer.setSingleShot(True)
+        self.report_timer.timeout.connect(lambda: self.finish(*self.report))
+
+    def start(self):
+        raise NotImplementedError
+
+    def reset(self):
+        self.report_timer.stop()
+        self.report = None
+        self.outcome = None
+
+    def finish(self, result, score=None):
+        if self.outcome is not None:
+            return
+        self.outcome = {"Result": result, "Score": score}
+        self.finished.emit(self.outcome)
+
+    def finish_later(self, result, score=None):
+        """finish() after the final screen has been up for RESULT_DELAY ms."""
+        self.report = (result, score)
+        self.report_timer.start(ms(RESULT_DELAY))
+
+
+# ---------- Shell window ----------
+class GameShell(QWidget):
+    """One long-lived window; each game is shown as a page of a stacked widget."""
+
+    def __init__(self, title="Mini Games"):
+        super().__init__()
+        self.setWindowTitle(title)
+        self.current = None
+
+        self.lobby = QLabel("Waiting for the host…")
+        self.lobby.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        self.lobby.setStyleSheet("font-size: 20px;")
+
+        self.stack = QStackedWidget()
+        self.stack.addWidget(self.lobby)
+
+        layout = QVBoxLayout()
+        layout.setContentsMargins(0, 0, 0, 0)
+        layout.addWidget(self.stack)
+        self.setLayout(layout)
+
+    def show_message(self, text):
+        self.lobby.setText(text)
+        self.stack.setCurrentWidget(self.lobby)
+
+    def run(self, game, keep=False):
+        """Shows `game`, starts it and blocks (running Qt events) until it finishes.
+        Returns its outcome dict. The game is deleted afterwards unless `keep`."""
+        loop = QEventLoop()
+        game.finished.connect(lambda outcome: loop.quit())
+
+        self.current = game
+        self.stack.addWidget(game)
+        self.stack.setCurrentWidget(game)
+        self.setWindowTitle(game.windowTitle())
+        self.show()
+        game.setFocus()
+
+        game.start()
+        if game.outcome is None:
+            loop.exec()
+
+        self.current = None
+        self.show_message("Waiting for the next game…")
+        self.stack.removeWidget(game)
+        game.finished.disconnect()
+        if not keep:
+            game.deleteLater()
+        return game.outcome
+
+    def closeEvent(self, event):
+        # Closing the window gives up the game in progress, as before
+        if self.current is not None:
+            self.current.finish("Lose", 0)
+        super().closeEvent(event)
+
+
+_app = None
+_shell = None
+
+def get_shell():
+    """The shared shell window (and QApplication), created on first use."""
+    global _app, _shell
+    if _shell is None:
+        _app = QApplication.instance() or QApplication(sys.argv)
+        _shell = GameShell()
+    return _shell
@@ -1,12 +1,13 @@
-import os, json, time, random
+import os, json, time, queue, random, atexit, socket, threading
+from collections import deque
 from datetime import datetime
-import paramiko
+from log_writer import BatchedLogWriter
+from event_batch import encode_batch, batch_name, compact, last_seq_in, last_seq_of
+from host_link import SSHHostLink, LocalHostLink, RECONNECT_BACKOFF, start_of_last_line
+from transport import join_host
 
-# --- Imported minigames ---
-from minigames.memory_game import play_memory_game
-from minigames.juego_ecuacion import run_equation_game
-from minigames.juego_colores import run_reaction_game
-from minigames.juego_globos import run_balloon_game
+# --- Minigames (imported when first scheduled; Qt is loaded by warm_up()) ---
+from minigames import registry
 
 # =====================================================
 # SSH CONFIG 
@@ -20,7 +21,32 @@ HOST_PASSWORD = "P0ck3tM0nst3rs"
 LOG_FILE = "player_events.log"
 
 # Professor’s folder (you said you will fix later)
-HOST_TARGET_FOLDER = f"/home/minipc/Desktop/Game_App/Player_logs/{LOG_FILE}"
+HOST_TARGET_DIR = "/home/minipc/Desktop/Game_App/Player_logs"
+HOST_TARGET_FOLDER = f"{HOST_TARGET_DIR}/{LOG_FILE}"
+
+# Compressed EVB1 batches go to the host's inbox (unpacked there by
+# event_batch.PlayerInbox); False appends plain JSON lines to HOST_TARGET_FOLDER
+SHIP_COMPRESSED = True
+HOST_INBOX_DIR = f"{HOST_TARGET_DIR}/inbox"
+
+# =====================================================
+# GAME PROTOCOL (host.py: Join/Ack, then Assign -> Result per game)
+# =====================================================
+# "file:<shared folder>" also works; None = host that only writes
+# game_status.log, in which case the player draws its own games
+HOST_TRANSPORT = f"tcp://{HOST_IP}:5555"
+JOIN_TIMEOUT = 10         # seconds per Join attempt
+HEARTBEAT_INTERVAL = 5    # host.py expects one at least every 15 s once they start
+ASSIGN_TIMEOUT = 30       # seconds without an Assign before rejoining the host
+ROUNDS = ["R1", "R2"]
+GAMES_PER_ROUND = 3
+LOOKAHEAD = 2
+
+# Background shipping
+SHIP_BATCH_WINDOW = 0.2   # events logged within this window share one upload
+SHIP_QUEUE_SIZE = 1000
+EXIT_FLUSH_TIMEOUT = 3    # seconds to wait for unshipped events at exit
+SPOOL_RETRY_INTERVAL = 5  # seconds between delivery attempts while the host is offline
 
 # =====================================================
 # LOCAL PATHS
@@ -28,43 +54,214 @@ HOST_TARGET_FOLDER = f"/home/minipc/Desktop/Game_App/Player_logs/{LOG_FILE}"
 PLAYER_LOG = os.path.join("logs", LOG_FILE)
 PLAYER_ID = "P001"
 
-os.makedirs("logs", exist_ok=True)
+# Batches not yet acknowledged by the host, and the last acknowledged Seq
+SPOOL_DIR = os.path.join("logs", "spool")
+ACK_FILE = os.path.join(SPOOL_DIR, "ack.json")
+
+os.makedirs(SPOOL_DIR, exist_ok=True)
 
 
 # =====================================================
-# SSH UPLOAD FUNCTION
+# HOST LINK (one SSH/SFTP session reused by every upload/poll)
 # =====================================================
-def upload_log_via_ssh():
+# PLAYER_FAKE_HOST=<folder> runs against a local stand-in of the mini-PC
+if os.environ.get("PLAYER_FAKE_HOST"):
+    HOST_LINK = LocalHostLink(os.environ["PLAYER_FAKE_HOST"])
+else:
+    HOST_LINK = SSHHostLink(HOST_IP, HOST_PORT, HOST_USERNAME, HOST_PASSWORD, RECONNECT_BACKOFF)
+
+atexit.register(HOST_LINK.close)
+
+
+# =====================================================
+# OFFLINE SPOOL
+# =====================================================
+def journal_last_seq():
+    return last_seq_of(PLAYER_LOG)
+
+
+def read_ack():
     try:
-        ssh = paramiko.SSHClient()
-        ssh.set_missing_host_key_policy(paramiko.AutoAddPolicy())
-        ssh.connect(HOST_IP, HOST_PORT, HOST_USERNAME, HOST_PASSWORD)
+        with open(ACK_FILE, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (FileNotFoundError, ValueError):
+        return {"Seq": 0, "RemoteSize": None}
 
-        sftp = ssh.open_sftp()
 
-        # Ensure directory exists
-        try:
-            sftp.stat(HOST_TARGET_FOLDER)
-        except:
-            sftp.mkdir(HOST_TARGET_FOLDER)
+def write_ack(seq, remote_size):
+    tmp_path = ACK_FILE + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump({"Seq": seq, "RemoteSize": remote_size}, f)
+    os.replace(tmp_path, ACK_FILE)
+
+
+def spool_batch(lines):
+    first_seq = json.loads(lines[0])["Seq"]
+    path = os.path.join(SPOOL_DIR, f"batch_{first_seq:010d}.jsonl")
+    with open(path + ".tmp", "w", encoding="utf-8") as f:
+        f.write("".join(lines))
+    os.replace(path + ".tmp", path)
+
+
+def spooled_files():
+    return sorted(os.path.join(SPOOL_DIR, name) for name in os.listdir(SPOOL_DIR)
+                  if name.startswith("batch_") and name.endswith(".jsonl"))
+
+
+def spool_last_seq():
+    files = spooled_files()
+    if not files:
+        return 0
+    with open(files[-1], "r", encoding="utf-8") as f:  # named by first Seq: the last one ends highest
+        return last_seq_in(f.read())
+
+
+def read_spool(files, after_seq):
+    """Spooled event lines newer than `after_seq`, once per Seq, in Seq order."""
+    events = {}
+    for path in files:
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    seq = json.loads(line)["Seq"]
+                except (ValueError, KeyError):
+                    continue
+                if seq > after_seq:
+                    events.setdefault(seq, line)
+    return [events[seq] for seq in sorted(events)]
 
-        # Upload log
-        remote_path = HOST_TARGET_FOLDER
-        sftp.put(PLAYER_LOG, remote_path)
 
-        sftp.close()
-        ssh.close()
-        print(f"[SSH] Log file uploaded → {remote_path}")
+# =====================================================
+# SSH UPLOAD FUNCTION (delivers the whole spool in one transfer)
+# =====================================================
+def remote_last_seq(path, size):
+    if not size:
+        return None
+    seq = last_seq_in(HOST_LINK.read(path, start_of_last_line(HOST_LINK, path, size)))
+    return seq or None
+
+
+def send_spool_batch(files):
+    """Uploads the spool as one compressed batch file. Returns (events, bytes sent)."""
+    ack = read_ack()
+    lines = read_spool(files, ack["Seq"])
+    if not lines:
+        return 0, 0
+
+    data = encode_batch(lines)
+    first_seq, last_seq = json.loads(lines[0])["Seq"], json.loads(lines[-1])["Seq"]
+    remote_path = f"{HOST_INBOX_DIR}/{batch_name(PLAYER_ID, first_seq, last_seq)}"
+
+    HOST_LINK.write(remote_path, data)  # atomic: the host never unpacks a partial batch
+
+    write_ack(last_seq, ack["RemoteSize"])
+    return len(lines), len(data)
+
+
+def append_spool(files):
+    """Appends the spool to the host's copy of player_events.log. Returns (events, bytes sent)."""
+    remote_path = HOST_TARGET_FOLDER
+    ack = read_ack()
+    size = HOST_LINK.size(remote_path)
+
+    if size != ack["RemoteSize"]:
+        # Not the file we last appended to: see which Seq it really ends with
+        seq = remote_last_seq(remote_path, size)
+        if seq is None:
+            # Unknown contents: replace it with the journal, which has every event
+            HOST_LINK.upload(PLAYER_LOG, remote_path)
+            write_ack(journal_last_seq(), os.path.getsize(PLAYER_LOG))
+            return len(read_spool(files, 0)), os.path.getsize(PLAYER_LOG)
+        ack = {"Seq": seq, "RemoteSize": size}
+
+    lines = read_spool(files, ack["Seq"])  # drops events the host already has
+    data = "".join(lines).encode("utf-8")
+    if data:
+        HOST_LINK.append(remote_path, data)
+    write_ack(last_seq_in(data) or ack["Seq"], (ack["RemoteSize"] or 0) + len(data))
+    return len(lines), len(data)
+
+
+def upload_log_via_ssh():
+    """Ships every spooled batch. Returns True once the spool is empty."""
+    files = spooled_files()
+    if not files:
+        return True
+
+    try:
+        with HOST_LINK.lock:
+            HOST_LINK.makedirs(HOST_TARGET_DIR, HOST_INBOX_DIR)
+            if SHIP_COMPRESSED:
+                events, sent = send_spool_batch(files)
+            else:
+                events, sent = append_spool(files)
+
+        for path in files:
+            os.remove(path)
+        print(f"[SSH] {events} events from {len(files)} batches shipped ({sent} bytes)")
+        return True
 
     except Exception as e:
-        print(f"[SSH ERROR]: {e}")
+        print(f"[SSH ERROR]: {e} ({len(files)} batches kept in {SPOOL_DIR})")
+        HOST_LINK.close()
+        return False
+
+
+# =====================================================
+# BACKGROUND LOG SHIPPING
+# =====================================================
+class PlayerLogShipper(BatchedLogWriter):
+    """Appends events to the local journal (PLAYER_LOG), spools every batch
+    and ships the spool to the host from the writer thread, so games never
+    wait on SSH. While the host is offline batches pile up in SPOOL_DIR and
+    go out together once it is back."""
+
+    def write_event(self, event):
+        self.write(compact(event) + "\n")
+
+    def _write_batch(self, f, lines):
+        super()._write_batch(f, lines)
+        spool_batch(lines)
+        upload_log_via_ssh()
+
+    def _sync(self, f):
+        super()._sync(f)
+        upload_log_via_ssh()  # retries whatever a failed upload left behind
+
+    def start_retry(self, interval=SPOOL_RETRY_INTERVAL):
+        """Retries delivery every `interval` seconds while the spool is not empty."""
+        def loop():
+            while not self._closed:
+                time.sleep(interval)
+                if spooled_files() and not self._closed:
+                    self._ensure_started()
+                    self.flush(sync=True)
+        threading.Thread(target=loop, name="spool-retry", daemon=True).start()
+
+
+SHIPPER = PlayerLogShipper(PLAYER_LOG, flush_interval=SHIP_BATCH_WINDOW, max_queue=SHIP_QUEUE_SIZE)
+atexit.register(SHIPPER.close, EXIT_FLUSH_TIMEOUT)  # runs before HOST_LINK.close
 
 
 # =====================================================
 # LOGGING FUNCTION
 # =====================================================
+_seq_lock = threading.Lock()
+# A lost or truncated journal must not restart Seq below what was already
+# spooled or delivered: the host drops events whose Seq it has seen
+_last_seq = max(journal_last_seq(), read_ack()["Seq"] or 0, spool_last_seq())
+
+
+def next_seq():
+    global _last_seq
+    with _seq_lock:
+        _last_seq += 1
+        return _last_seq
+
+
 def log_player_event(stage, game_name, action, result):
     entry = {
+        "Seq": next_seq(),
         "timestamp": datetime.now().isoformat(),
         "stage": stage,
         "PlayerID": PLAYER_ID,
@@ -73,115 +270,450 @@ def log_player_event(stage, game_name, action, result):
         "Result": result
     }
 
-    with open(PLAYER_LOG, "a", encoding="utf-8") as f:
-        f.write(json.dumps(entry, ensure_ascii=False) + "\n")
-
-    upload_log_via_ssh()
+    SHIPPER.write_event(entry)
 
 
 # =====================================================
 # WAIT FOR HOST ACCEPTANCE (game_status.log)
 # =====================================================
-def wait_for_host_accept():
-    STATUS_FILE = "/home/minipc/Desktop/miniproyecto2/game_status.log"
+STATUS_FILE = "/home/minipc/Desktop/miniproyecto2/game_status.log"
+POLL_INTERVAL = 1  # seconds
 
-    print("Waiting for host… (looking for Action: Accepted)")
 
-    last_line = None
+def read_new_status_lines(offset, pending):
+    """Reads STATUS_FILE past `offset`. Returns (complete lines, new offset, partial last line)."""
+    with HOST_LINK.lock:  # shared with the shipping thread
+        size = HOST_LINK.size(STATUS_FILE)
+        if size is None:
+            raise FileNotFoundError(STATUS_FILE)
 
-    while True:
-        try:
-            ssh = paramiko.SSHClient()
-            ssh.set_missing_host_key_policy(paramiko.AutoAddPolicy())
-            ssh.connect(HOST_IP, HOST_PORT, HOST_USERNAME, HOST_PASSWORD)
+        if offset is None:
+            # Like before, the line already at the end counts too
+            offset = start_of_last_line(HOST_LINK, STATUS_FILE, size)
+        elif size < offset:
+            offset, pending = 0, b""  # host log was rotated
 
-            sftp = ssh.open_sftp()
+        if size <= offset:
+            return [], offset, pending
 
-            try:
-                remote_file = sftp.open(STATUS_FILE, "r")
-                lines = remote_file.readlines()
+        chunk = HOST_LINK.read(STATUS_FILE, offset, size - offset)
 
-                if lines:
-                    new_line = lines[-1].strip()
+    *lines, pending = (pending + chunk).split(b"\n")
+    return lines, offset + len(chunk), pending
 
-                    if new_line != last_line:
-                        last_line = new_line
-                        print(f"[HOST MESSAGE] {new_line}")
 
-                        try:
-                            data = json.loads(new_line)
-                        except:
-                            print("Invalid JSON, skipping")
-                            continue
+def parse_status_line(raw):
+    """One raw game_status.log line -> event dict, or None if it isn't for this player."""
+    new_line = raw.decode("utf-8", errors="replace").strip()
+    if not new_line:
+        return None
+    print(f"[HOST MESSAGE] {new_line}")
 
-                        if data.get("Action") == "Accepted":
-                            print("Host accepted. Beginning rounds!")
-                            remote_file.close()
-                            sftp.close()
-                            ssh.close()
-                            return  # DONE — return control to play_game()
+    try:
+        data = json.loads(new_line)
+    except ValueError:
+        print("Invalid JSON, skipping")
+        return None
 
-                remote_file.close()
+    if data.get("PlayerID", PLAYER_ID) != PLAYER_ID:
+        return None
+    return data
 
-            except IOError:
-                pass  # File not created yet
 
-            sftp.close()
-            ssh.close()
+def poll_for_host_accept():
+    """Fallback when the status stream can't be opened: SFTP tail every POLL_INTERVAL."""
+    offset = None     # bytes of STATUS_FILE already checked
+    pending = b""     # last line, until the host finishes writing it
+
+    while True:
+        try:
+            lines, offset, pending = read_new_status_lines(offset, pending)
+
+            for raw in lines:
+                data = parse_status_line(raw)
+                if data and data.get("Action") == "Accepted":
+                    return
+
+        except FileNotFoundError:
+            pass  # File not created yet
 
         except Exception as e:
             print(f"Error while reading host file: {e}")
+            HOST_LINK.close()
 
-        time.sleep(1)
+        time.sleep(POLL_INTERVAL)
 
 
 # =====================================================
-# MAIN GAME LOOP (3 ROUNDS)
+# HOST STATUS STREAM (tail -F over one SSH exec channel)
 # =====================================================
-def play_game():
-    wait_for_host_accept()
+class HostStatusStream:
+    """Follows STATUS_FILE with `tail -F` through HOST_LINK and calls
+    callbacks[Action](event) for each new line about this player, so
+    Accepted/Assign/Sabotage arrive one network round trip after the host
+    writes them instead of at the next poll."""
+
+    def __init__(self, callbacks):
+        self.callbacks = callbacks
+        self.channel = None
+        self.failed = threading.Event()  # stream dropped; callers fall back to polling
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        self.channel = HOST_LINK.follow(STATUS_FILE)
+        self._thread = threading.Thread(target=self._run, name="host-status", daemon=True)
+        self._thread.start()
+        return self
+
+    def _run(self):
+        pending = b""
+        try:
+            while not self._stop.is_set():
+                try:
+                    chunk = self.channel.recv(4096)
+                except socket.timeout:
+                    continue
+                if not chunk:
+                    break  # channel closed by the host
+                *lines, pending = (pending + chunk).split(b"\n")
+                for raw in lines:
+                    self.dispatch(raw)
+        except Exception as e:
+            print(f"[SSH ERROR] Status stream: {e}")
+        finally:
+            if not self._stop.is_set():
+                self.failed.set()
+
+    def dispatch(self, raw):
+        data = parse_status_line(raw)
+        callback = data and self.callbacks.get(data.get("Action"))
+        if callback:
+            callback(data)
+
+    def stop(self):
+        self._stop.set()
+        if self.channel is not None:
+            self.channel.close()
+        if self._thread is not None:
+            self._thread.join(timeout=2)
+
+
+def wait_for_host_accept(callbacks=None):
+    """Blocks until the host accepts this player. Returns the status stream,
+    still running for the other callbacks, or None if polling was used."""
+    print("Waiting for host… (looking for Action: Accepted)")
+
+    accepted = threading.Event()
+    handlers = dict(callbacks or {})
+    handlers["Accepted"] = lambda event: accepted.set()
+
+    try:
+        stream = HostStatusStream(handlers).start()
+    except Exception as e:
+        print(f"[SSH] Status stream unavailable ({e}), polling instead")
+        stream = None
+
+    while stream is not None and not accepted.wait(0.5):
+        if stream.failed.is_set():
+            print("[SSH] Status stream lost, polling instead")
+            stream.stop()
+            stream = None
+
+    if stream is None:
+        poll_for_host_accept()
+
+    print("Host accepted. Beginning rounds!")
+    return stream
+
 
-    ROUNDS = 3
+# =====================================================
+# ASSIGNMENTS (what to play next, and where results go)
+# =====================================================
+GAME_NAMES = registry.names()
+
+
+def announce_sabotage(event):
+    print(f"[HOST] Sabotage: {event.get('Effect')} {event.get('Value')}")
+
+
+class HostAssignments:
+    """Assign and Sabotage messages from host.py, received on a background
+    thread. The games each Assign lists as Upcoming are kept in `upcoming`
+    so the next minigame can be prepared while this one is being played."""
+
+    def __init__(self, transport, ack):
+        self.transport = transport
+        self.remaining = len(ROUNDS) * GAMES_PER_ROUND - int(ack.get("GamesDone") or 0)
+        # The Ack lists the first game as well, until its Assign arrives
+        self.upcoming = deque((ack.get("Upcoming") or [])[:LOOKAHEAD + 1], maxlen=LOOKAHEAD + 1)
+        self._queue = queue.Queue()
+        threading.Thread(target=self._receive, name="host-assign", daemon=True).start()
+        threading.Thread(target=self._heartbeat, name="host-heartbeat", daemon=True).start()
+
+    def _receive(self):
+        while not self.transport.closed:
+            kind, message = self.transport.recv_first(["assign", "sabotage"], PLAYER_ID, timeout=1)
+            if kind == "assign":
+                self.upcoming.clear()
+                self.upcoming.extend(message.get("Upcoming") or [])
+                self._queue.put(message)
+            elif kind == "sabotage":
+                announce_sabotage(message)
+        self._queue.put(None)  # connection lost
+
+    def _heartbeat(self):
+        while not self.transport.closed and self.remaining > 0:
+            time.sleep(HEARTBEAT_INTERVAL)
+            try:
+                self.transport.send("heartbeat", PLAYER_ID, {"PlayerID": PLAYER_ID, "Action": "Heartbeat",
+                                                             "timestamp": datetime.now().isoformat()})
+            except OSError:
+                return
+
+    def poll(self):
+        """Next Assign if one has arrived, else None. Raises ConnectionError once the host is gone."""
+        try:
+            message = self._queue.get_nowait()
+        except queue.Empty:
+            return None
+        if message is None:
+            raise ConnectionError("lost the connection to the host")
+        return message
+
+    def send_result(self, assignment, result, score=None):
+        try:
+            self._send_result(assignment, result, score)
+        except OSError as e:
+            raise ConnectionError(f"lost the connection to the host: {e}")
+        self.remaining -= 1
+
+    def _send_result(self, assignment, result, score):
+        self.transport.send("result", PLAYER_ID, {
+            "PlayerID": PLAYER_ID,
+            "stage": assignment["stage"],
+            "GameName": assignment["GameName"],
+            "GameID": assignment["GameID"],
+            "Action": "Result",
+            "Result": result,
+            "Score": score,
+            "timestamp": datetime.now().isoformat(),
+        })
+
+    def close(self):
+        self.transport.close()
+
+
+class LocalAssignments:
+    """Same interface for a host without the game protocol: every game is
+    drawn here, up front, so the look-ahead works the same way."""
+
+    def __init__(self, stream=None):
+        self.stream = stream
+        self.plan = [(stage, random.choice(GAME_NAMES)) for stage in ROUNDS for _ in range(GAMES_PER_ROUND)]
+        self.remaining = len(self.plan)
+        self.upcoming = deque((name for _, name in self.plan[:LOOKAHEAD + 1]), maxlen=LOOKAHEAD + 1)
+
+    def planned(self):
+        return [name for _, name in self.plan]
+
+    def poll(self):
+        stage, game = self.plan.pop(0)
+        self.upcoming.clear()
+        self.upcoming.extend(name for _, name in self.plan[:LOOKAHEAD])
+        return {"stage": stage, "GameName": game, "GameID": None}
+
+    def send_result(self, assignment, result, score=None):
+        self.remaining -= 1
+
+    def close(self):
+        if self.stream is not None:
+            self.stream.stop()
+
+
+def connect_to_host(local=None):
+    """Joins the host (retrying until it answers) and returns where assignments come from.
+    `local`: the LocalAssignments to use when the host has no game protocol."""
+    if HOST_TRANSPORT is None:
+        games = local or LocalAssignments()
+        # The status stream keeps running after Accepted for the host's Sabotage lines
+        games.stream = wait_for_host_accept({"Sabotage": announce_sabotage})
+        return games
+
+    print(f"Joining host at {HOST_TRANSPORT}…")
+    join = {"PlayerID": PLAYER_ID, "Action": "Join", "timestamp": datetime.now().isoformat()}
+    attempt = 0
+    while True:
+        try:
+            transport, ack = join_host(HOST_TRANSPORT, PLAYER_ID, join, timeout=JOIN_TIMEOUT)
+            if ack is not None:
+                break
+            transport.close()
+        except OSError as e:
+            print(f"Host not reachable: {e}")
+        time.sleep(RECONNECT_BACKOFF[min(attempt, len(RECONNECT_BACKOFF) - 1)])
+        attempt += 1
+
+    if ack.get("Resume"):
+        print(f"Host accepted. Resuming at {ack.get('ResumeStage')} ({ack.get('GamesDone')} games done)")
+    else:
+        print("Host accepted. Beginning rounds!")
+    return HostAssignments(transport, ack)
+
+
+# =====================================================
+# WARM-UP (done while the host handshake is pending)
+# =====================================================
+POOL = None  # GamePool of ready, hidden games; created by warm_up() along with Qt
+# PLAYER_HEADLESS=<speed> plays every game offscreen with scripted input,
+# <speed> times faster than real time (CI and load tests)
+HEADLESS_SPEED = float(os.environ.get("PLAYER_HEADLESS") or 0)
+
+
+def prepare_game(name):
+    """Builds the game ahead of time, hidden, so the round can start on an
+    instance whose layouts, styles and fonts are already set up.
+    Returns True if it had to build one (importing its module the first time)."""
+    return POOL.prepare(name)
+
+
+def warm_up():
+    """Loads Qt and opens the game shell. The games themselves are imported
+    and built once the host schedules them (see next_assignment())."""
+    global POOL
+    start = time.perf_counter()
+    if HEADLESS_SPEED:
+        from minigames import headless
+        headless.enable(HEADLESS_SPEED)  # before the QApplication exists
+    from PyQt6.QtGui import QFontDatabase
+    from PyQt6.QtWidgets import QApplication
+    from minigames.shell import get_shell
+    from minigames.pool import GamePool
+
+    shell = get_shell()
+    shell.show_message("Waiting for the host…")
+    shell.show()
+    app = QApplication.instance()
+    QFontDatabase.families()  # loads the font cache
+    POOL = GamePool(registry.load)
+
+    print(f"[WARM-UP] GUI ready in {time.perf_counter() - start:.2f}s")
+    return app
+
+
+def prepare_one(names):
+    """Builds the first of `names` without a ready instance. Returns True if it built one."""
+    return any(prepare_game(name) for name in names)
+
+
+def connect_in_background(local=None):
+    """Starts connect_to_host() on a background thread. Returns a function
+    that waits for it, processing Qt events on the main thread meanwhile.
+    With a `local` plan its games are built while the host is pending."""
+    done = threading.Event()
+    result = {}
+
+    def connect():
+        try:
+            result["games"] = connect_to_host(local)
+        finally:
+            done.set()
+
+    def wait(app):
+        while not done.wait(0.02):
+            if local is not None:
+                prepare_one(local.planned())  # one game per pass, so the window stays responsive
+            app.processEvents()  # keeps deferred deletes and timers moving
+        return result["games"]
+
+    threading.Thread(target=connect, name="host-connect", daemon=True).start()
+    return wait
+
+
+def connect_while_warming():
+    """connect_to_host() while the main thread warms up Qt, which must
+    happen on the main thread."""
+    # Without the game protocol the plan is drawn here, so it is known before Accepted
+    wait = connect_in_background(LocalAssignments() if HOST_TRANSPORT is None else None)
+    app = warm_up()
+    return app, wait(app)
+
+
+def reconnect(app, games, reason):
+    """Joins the host again after losing it. The new Ack says how many games
+    are done; a game whose Result never arrived is assigned again."""
+    print(f"\n{reason}. Rejoining the host…")
+    games.close()
+    from minigames.shell import get_shell
+    get_shell().show_message("Reconnecting to the host…")
+    return connect_in_background()(app)
+
+
+def next_assignment(app, games, timeout=ASSIGN_TIMEOUT):
+    """Waits for the next Assign, preparing the announced games meanwhile.
+    Raises ConnectionError if none arrives within `timeout` seconds."""
+    deadline = time.monotonic() + timeout
+    while True:
+        assignment = games.poll()
+        if assignment is not None:
+            return assignment
+        if time.monotonic() > deadline:
+            raise ConnectionError(f"no Assign from the host in {timeout}s")
+        prepare_one(list(games.upcoming))  # one game per pass, so the window stays responsive
+        app.processEvents()
+        time.sleep(0.02)
 
-    for round_num in range(1, ROUNDS + 1):
-        print(f"\n===== ROUND {round_num}/3 =====")
 
-        # Random game selection
-        game = random.choice([
-            "MemoryGame",
-            "EquationGame",
-            "ReactionGame",
-            "BalloonGame"
-        ])
+# =====================================================
+# MINIGAMES
+# =====================================================
+def run_minigame(game):
+    """Plays one game in the shell window, on the main thread. Returns (result, score).
+    The instance comes from POOL and goes back to it, reset, afterwards."""
+    if game not in registry.REGISTRY:
+        return "Lose", None
 
-        log_player_event(f"Round{round_num}", game, "Start", "Running")
-        print(f"Starting game → {game}")
+    if HEADLESS_SPEED:
+        from minigames.headless import drive_next
+        drive_next(game)
+    outcome = POOL.play(game)
+    return outcome["Result"], outcome["Score"]
 
-        # Run selected game
-        if game == "MemoryGame":
-            result = play_memory_game()
 
-        elif game == "EquationGame":
-            score = run_equation_game()
-            result = "Win" if score > 0 else "Lose"
+# =====================================================
+# MAIN GAME LOOP (ROUNDS x GAMES_PER_ROUND, as assigned by the host)
+# =====================================================
+def play_game():
+    SHIPPER.start_retry()  # also delivers batches left over from a previous run
+    app, games = connect_while_warming()
 
-        elif game == "ReactionGame":
-            win = run_reaction_game()
-            result = "Win" if win else "Lose"
+    try:
+        while games.remaining > 0:
+            try:
+                assignment = next_assignment(app, games)
+            except ConnectionError as e:
+                games = reconnect(app, games, e)
+                continue
+            stage, game = assignment["stage"], assignment["GameName"]
 
-        elif game == "BalloonGame":
-            win = run_balloon_game()
-            result = "Win" if win else "Lose"
+            known = game in registry.REGISTRY
+            print(f"\n===== {stage}: {registry.entry(game).describe() if known else game} =====")
+            log_player_event(stage, game, "Start", "Running")
 
-        else:
-            result = "Lose"
+            result, score = run_minigame(game)
 
-        log_player_event(f"Round{round_num}", game, "End", result)
-        print(f"[RESULT] {game} finished → {result}")
+            log_player_event(stage, game, "End", result)
+            try:
+                games.send_result(assignment, result, score)
+            except ConnectionError as e:
+                games = reconnect(app, games, e)
+                continue
+            print(f"[RESULT] {game} finished → {result}")
 
-        time.sleep(1)
+    finally:
+        games.close()
 
-    print("\nAll 3 rounds completed!")
+    print("\nAll rounds completed!")
 
 
 # =====================================================
@@ -0,0 +1,134 @@
+import os, json, threading
+from datetime import datetime, timedelta
+
+SNAPSHOT_FILE = os.path.join("logs", "host_snapshot.json")
+SNAPSHOT_INTERVAL = 5  # seconds
+RESUME_WINDOW = timedelta(minutes=30)  # older sessions are considered abandoned
+ROUNDS = ["R1", "R2"]
+
+
+# ---------- Session state from log events ----------
+def new_state():
+    return {"stage": "Lobby", "games_done": 0, "game_name": None, "game_id": None}
+
+def apply_event(sessions, event):
+    """Folds one game_status.log event into `sessions` (PlayerID -> state dict)."""
+    player_id = event.get("PlayerID")
+    action = event.get("Action")
+    stage = event.get("stage")
+    if player_id is None:
+        return
+    if action == "Accepted":
+        if not event.get("Resume") or player_id not in sessions:
+            sessions[player_id] = new_state()
+        sessions[player_id]["updated"] = event.get("timestamp")
+        return
+    state = sessions.get(player_id)
+    if state is None:
+        return
+    state["updated"] = event.get("timestamp")
+    if action == "Start" and stage in ROUNDS:
+        state["stage"] = stage
+    elif action == "Assign":
+        state["game_name"] = event.get("GameName")
+        state["game_id"] = event.get("GameID")
+    elif action == "ResultReceived" and event.get("GameID") == state["game_id"]:
+        state["games_done"] += 1
+        state["game_name"] = state["game_id"] = None
+    elif (action == "End" and stage == "Game") or action == "Error":
+        # Timeout/Disconnected keep the session: the player may re-join within RESUME_WINDOW
+        del sessions[player_id]
+
+def read_log_tail(log_path, offset):
+    """Returns the events after byte `offset` and the offset of the last complete line."""
+    events = []
+    try:
+        if os.path.getsize(log_path) < offset:
+            offset = 0  # log was truncated or replaced
+        with open(log_path, "rb") as f:
+            f.seek(offset)
+            data = f.read()
+    except FileNotFoundError:
+        return events, 0
+    end = data.rfind(b"\n") + 1  # a half-written last line is left for next time
+    for line in data[:end].splitlines():
+        try:
+            events.append(json.loads(line))
+        except json.JSONDecodeError:
+            continue
+    return events, offset + end
+
+
+# ---------- Snapshots ----------
+class SessionSnapshotter:
+    """Keeps a compact snapshot of every live session (round, games done,
+    pending GameID) plus the log offset it covers.
+
+    The snapshot is built by folding only the new part of the log into the
+    previous snapshot, so it always matches what the log says; after a crash
+    the host loads it and replays just the tail written since.
+    """
+
+    def __init__(self, log_path, snapshot_path=SNAPSHOT_FILE, flush=None, tail=read_log_tail):
+        self.log_path = log_path
+        self.snapshot_path = snapshot_path
+        self.flush = flush  # makes queued log lines visible before reading the tail
+        self.tail = tail    # read_log_tail for JSONL, event_store.events_after for SQLite
+        self.sessions = {}
+        self.offset = 0
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def load(self):
+        try:
+            with open(self.snapshot_path, "r", encoding="utf-8") as f:
+                snapshot = json.load(f)
+            self.sessions = snapshot["sessions"]
+            self.offset = snapshot["offset"]
+        except (FileNotFoundError, json.JSONDecodeError, KeyError):
+            self.sessions, self.offset = {}, 0
+        return self.sessions
+
+    def catch_up(self):
+        with self._lock:
+            if self.flush:
+                self.flush()
+            events, self.offset = self.tail(self.log_path, self.offset)
+            for event in events:
+                apply_event(self.sessions, event)
+            return {pid: dict(state) for pid, state in self.sessions.items()}
+
+    def snapshot(self):
+        sessions = self.catch_up()
+        snapshot = {"timestamp": datetime.now().isoformat(), "offset": self.offset, "sessions": sessions}
+        tmp_path = self.snapshot_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(snapshot, f, ensure_ascii=False, separators=(",", ":"))
+        os.replace(tmp_path, self.snapshot_path)
+        return snapshot
+
+    def recover(self, window=RESUME_WINDOW):
+        """Latest snapshot + log tail -> sessions that were in progress."""
+        self.load()
+        sessions = self.catch_up()
+        cutoff = (datetime.now() - window).isoformat()
+        return {pid: state for pid, state in sessions.items() if (state.get("updated") or "") >= cutoff}
+
+    def start(self, interval=SNAPSHOT_INTERVAL):
+        def loop():
+            while not self._stop.wait(interval):
+                try:
+                    self.snapshot()
+                except OSError as e:
+                    print(f"❌ Snapshot failed: {e}")
+        self._stop.clear()
+        self._thread = threading.Thread(target=loop, name="snapshotter", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self.snapshot()
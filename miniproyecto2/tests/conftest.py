@@ -0,0 +1,21 @@
+import os, sys, importlib, tempfile
+import pytest
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(HERE))
+
+# player.py picks its host link at import: never the real mini-PC from a test
+os.environ.setdefault("PLAYER_FAKE_HOST", tempfile.mkdtemp(prefix="fake_host_"))
+
+
+@pytest.fixture
+def player(tmp_path, monkeypatch):
+    """player.py running in an empty folder against a LocalHostLink fake of the mini-PC."""
+    monkeypatch.chdir(tmp_path)  # logs/ and the spool are relative to the working folder
+    os.makedirs(os.path.join("logs", "spool"))
+    module = importlib.import_module("player")
+    from host_link import LocalHostLink
+    link = LocalHostLink(str(tmp_path / "remote"))
+    link.makedirs(module.HOST_TARGET_DIR, module.HOST_INBOX_DIR)
+    monkeypatch.setattr(module, "HOST_LINK", link)
+    return module
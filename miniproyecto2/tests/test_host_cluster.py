@@ -0,0 +1,34 @@
+import os
+from collections import Counter
+from host_cluster import HashRing, shard_name, shard_address, shard_folder, HOST_FOLDER
+
+PLAYERS = [f"P{i:04d}" for i in range(2000)]
+
+
+def test_ring_is_deterministic():
+    nodes = [shard_name(i) for i in range(4)]
+    assert [HashRing(nodes).node_for(p) for p in PLAYERS] == [HashRing(nodes).node_for(p) for p in PLAYERS]
+
+def test_ring_spreads_players_evenly():
+    ring = HashRing([shard_name(i) for i in range(4)])
+    counts = Counter(ring.node_for(p) for p in PLAYERS)
+    assert len(counts) == 4
+    assert min(counts.values()) > len(PLAYERS) / 4 * 0.7
+
+def test_adding_a_shard_moves_only_its_share():
+    before = HashRing([shard_name(i) for i in range(4)])
+    after = HashRing([shard_name(i) for i in range(5)])
+    moved = [p for p in PLAYERS if before.node_for(p) != after.node_for(p)]
+    assert all(after.node_for(p) == shard_name(4) for p in moved)  # only onto the new shard
+    assert len(moved) < len(PLAYERS) / 5 * 1.5
+
+def test_shard_addresses():
+    assert shard_address("tcp://0.0.0.0:5555", 0) == "tcp://0.0.0.0:5556"
+    assert shard_address("tcp://0.0.0.0:5555", 2) == "tcp://0.0.0.0:5558"
+    assert shard_address("unix:/tmp/host.sock", 1) == "unix:/tmp/host.shard_1.sock"
+    assert shard_address("file:shared", 1) == "file"
+
+def test_shard_folders_follow_the_router_folder():
+    assert shard_folder("file", 1) == os.path.join(HOST_FOLDER, "shard_1")
+    assert shard_folder("file:shared", 1) == os.path.join("shared", "shard_1")
+    assert shard_folder("tcp://0.0.0.0:5555", 0) == os.path.join(HOST_FOLDER, "shard_0")
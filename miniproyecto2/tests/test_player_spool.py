@@ -0,0 +1,139 @@
+import os, json
+from event_batch import decode_batch
+from host_link import start_of_last_line
+
+
+def line(seq, **fields):
+    return json.dumps({"Seq": seq, **fields}) + "\n"
+
+def spool(player, *seqs):
+    player.spool_batch([line(seq) for seq in seqs])
+
+def journal(player, *seqs):
+    with open(player.PLAYER_LOG, "a", encoding="utf-8") as f:
+        f.write("".join(line(seq) for seq in seqs))
+
+def remote_seqs(player, path):
+    with open(player.HOST_LINK._local(path), encoding="utf-8") as f:
+        return [json.loads(l)["Seq"] for l in f]
+
+def inbox(player):
+    folder = player.HOST_LINK._local(player.HOST_INBOX_DIR)
+    return sorted(os.listdir(folder))
+
+
+# ---------- Seq helpers ----------
+def test_last_seq_in_skips_a_half_written_last_line(player):
+    assert player.last_seq_in(line(1) + line(2) + '{"Seq": 3, "Ac') == 2
+
+def test_last_seq_in_without_events(player):
+    assert player.last_seq_in("") == 0
+    assert player.last_seq_in("not json\n") == 0
+
+def test_spool_last_seq_reads_the_newest_batch(player):
+    assert player.spool_last_seq() == 0
+    spool(player, 1, 2)
+    spool(player, 10, 11, 12)
+    assert player.spool_last_seq() == 12
+
+def test_start_of_last_line_across_chunks(player):
+    path = "/remote.log"
+    data = (line(1) + line(2, Padding="x" * 50)).encode()
+    with open(player.HOST_LINK._local(path), "wb") as f:
+        f.write(data)
+    offset = start_of_last_line(player.HOST_LINK, path, len(data), chunk=8)
+    assert offset == len(line(1))
+
+
+# ---------- Ack file ----------
+def test_read_ack_defaults_when_missing_or_corrupt(player):
+    assert player.read_ack() == {"Seq": 0, "RemoteSize": None}
+    with open(player.ACK_FILE, "w") as f:
+        f.write("{truncated")
+    assert player.read_ack() == {"Seq": 0, "RemoteSize": None}
+
+def test_write_ack_round_trip(player):
+    player.write_ack(7, 123)
+    assert player.read_ack() == {"Seq": 7, "RemoteSize": 123}
+    assert not os.path.exists(player.ACK_FILE + ".tmp")
+
+
+# ---------- Spool ----------
+def test_read_spool_dedupes_and_orders_by_seq(player):
+    spool(player, 3, 4, 5)
+    spool(player, 1, 2, 3)  # a batch re-spooled after a crash repeats Seq 3
+    lines = player.read_spool(player.spooled_files(), 1)
+    assert [json.loads(l)["Seq"] for l in lines] == [2, 3, 4, 5]
+
+def test_read_spool_skips_lines_without_seq(player):
+    with open(os.path.join(player.SPOOL_DIR, "batch_0000000001.jsonl"), "w") as f:
+        f.write(line(1) + "garbage\n" + json.dumps({"Action": "x"}) + "\n" + line(2))
+    lines = player.read_spool(player.spooled_files(), 0)
+    assert [json.loads(l)["Seq"] for l in lines] == [1, 2]
+
+
+# ---------- Compressed shipping ----------
+def test_send_spool_batch_uploads_one_batch_and_acks_it(player):
+    spool(player, 1, 2)
+    spool(player, 3)
+    events, sent = player.send_spool_batch(player.spooled_files())
+    assert events == 3 and sent > 0
+    [name] = inbox(player)
+    assert name == player.batch_name(player.PLAYER_ID, 1, 3)
+    with open(os.path.join(player.HOST_LINK._local(player.HOST_INBOX_DIR), name), "rb") as f:
+        assert [e["Seq"] for e in decode_batch(f.read())] == [1, 2, 3]
+    assert player.read_ack()["Seq"] == 3
+
+def test_send_spool_batch_resends_nothing_already_acked(player):
+    spool(player, 1, 2)
+    player.send_spool_batch(player.spooled_files())
+    assert player.send_spool_batch(player.spooled_files()) == (0, 0)
+    assert len(inbox(player)) == 1
+
+def test_send_spool_batch_only_sends_what_is_past_the_ack(player):
+    spool(player, 1, 2, 3, 4)
+    player.write_ack(2, None)  # files kept after a crash between ack and delete
+    events, _ = player.send_spool_batch(player.spooled_files())
+    assert events == 2
+    assert inbox(player) == [player.batch_name(player.PLAYER_ID, 3, 4)]
+
+
+# ---------- Plain appending ----------
+def test_append_spool_to_a_new_remote_log(player):
+    spool(player, 1, 2)
+    events, sent = player.append_spool(player.spooled_files())
+    assert events == 2
+    assert remote_seqs(player, player.HOST_TARGET_FOLDER) == [1, 2]
+    assert player.read_ack() == {"Seq": 2, "RemoteSize": sent}
+
+def test_append_spool_after_a_lost_ack_does_not_duplicate(player):
+    spool(player, 1, 2)
+    player.append_spool(player.spooled_files())
+    player.write_ack(0, None)  # the append went through but its ack was never written
+    spool(player, 3)
+    events, _ = player.append_spool(player.spooled_files())
+    assert events == 1
+    assert remote_seqs(player, player.HOST_TARGET_FOLDER) == [1, 2, 3]
+
+def test_append_spool_replaces_a_remote_log_it_cannot_place(player):
+    journal(player, 1, 2, 3)
+    spool(player, 2, 3)
+    with open(player.HOST_LINK._local(player.HOST_TARGET_FOLDER), "w") as f:
+        f.write("written by someone else\n")
+    player.append_spool(player.spooled_files())
+    assert remote_seqs(player, player.HOST_TARGET_FOLDER) == [1, 2, 3]
+    assert player.read_ack() == {"Seq": 3, "RemoteSize": os.path.getsize(player.PLAYER_LOG)}
+
+
+# ---------- Delivery ----------
+def test_upload_empties_the_spool_once_delivered(player, monkeypatch):
+    monkeypatch.setattr(player, "SHIP_COMPRESSED", True)
+    spool(player, 1, 2)
+    assert player.upload_log_via_ssh()
+    assert player.spooled_files() == []
+
+def test_upload_keeps_the_spool_while_the_host_is_down(player, monkeypatch):
+    monkeypatch.setattr(player.HOST_LINK, "drop", 1.0)  # every request fails
+    spool(player, 1, 2)
+    assert not player.upload_log_via_ssh()
+    assert len(player.spooled_files()) == 1
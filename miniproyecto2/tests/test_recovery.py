@@ -0,0 +1,84 @@
+import json
+from datetime import datetime
+from recovery import apply_event, read_log_tail, SessionSnapshotter
+
+
+def fold(*events):
+    sessions = {}
+    for event in events:
+        apply_event(sessions, event)
+    return sessions
+
+def ev(action, stage="R1", player="P1", **fields):
+    return {"PlayerID": player, "Action": action, "stage": stage, "timestamp": datetime.now().isoformat(), **fields}
+
+
+def test_accepted_opens_a_session():
+    assert fold(ev("Accepted", "Lobby"))["P1"]["games_done"] == 0
+
+def test_events_before_accepted_are_ignored():
+    assert fold(ev("Assign", GameName="MemoryGame", GameID="P1_1_1")) == {}
+
+def test_assign_then_result_counts_a_game():
+    state = fold(ev("Accepted", "Lobby"), ev("Start"),
+                 ev("Assign", GameName="MemoryGame", GameID="P1_1_1"),
+                 ev("ResultReceived", GameName="MemoryGame", GameID="P1_1_1"))["P1"]
+    assert state["stage"] == "R1"
+    assert state["games_done"] == 1
+    assert state["game_name"] is None and state["game_id"] is None
+
+def test_pending_assign_is_remembered():
+    state = fold(ev("Accepted", "Lobby"), ev("Assign", GameName="BalloonGame", GameID="P1_1_1"))["P1"]
+    assert (state["game_name"], state["game_id"]) == ("BalloonGame", "P1_1_1")
+
+def test_result_for_another_game_is_not_counted():
+    state = fold(ev("Accepted", "Lobby"), ev("Assign", GameName="MemoryGame", GameID="P1_2_1"),
+                 ev("ResultReceived", GameName="MemoryGame", GameID="P1_1_1"))["P1"]
+    assert state["games_done"] == 0 and state["game_id"] == "P1_2_1"
+
+def test_game_end_and_error_close_the_session():
+    assert fold(ev("Accepted", "Lobby"), ev("End", "Game")) == {}
+    assert fold(ev("Accepted", "Lobby"), ev("Error")) == {}
+
+def test_timeout_and_disconnect_keep_the_session_resumable():
+    assert "P1" in fold(ev("Accepted", "Lobby"), ev("Timeout"))
+    assert "P1" in fold(ev("Accepted", "Lobby"), ev("Disconnected"))
+
+def test_resumed_accept_keeps_progress_and_plain_accept_resets_it():
+    played = [ev("Accepted", "Lobby"), ev("Assign", GameID="P1_1_1"), ev("ResultReceived", GameID="P1_1_1")]
+    assert fold(*played, ev("Accepted", "Lobby", Resume=True))["P1"]["games_done"] == 1
+    assert fold(*played, ev("Accepted", "Lobby"))["P1"]["games_done"] == 0
+
+def test_players_are_independent():
+    sessions = fold(ev("Accepted", "Lobby", player="A"), ev("Accepted", "Lobby", player="B"),
+                    ev("End", "Game", player="A"))
+    assert list(sessions) == ["B"]
+
+
+# ---------- Log tail ----------
+def test_read_log_tail_leaves_a_half_written_line(tmp_path):
+    path = tmp_path / "game_status.log"
+    path.write_text(json.dumps(ev("Accepted", "Lobby")) + "\n" + '{"PlayerID": "P1", "Act')
+    events, offset = read_log_tail(str(path), 0)
+    assert [e["Action"] for e in events] == ["Accepted"]
+    with open(path, "a") as f:
+        f.write('ion": "Start", "stage": "R1"}\n')
+    events, _ = read_log_tail(str(path), offset)
+    assert [e["Action"] for e in events] == ["Start"]
+
+def test_read_log_tail_restarts_after_truncation(tmp_path):
+    path = tmp_path / "game_status.log"
+    path.write_text(json.dumps(ev("Start")) + "\n")
+    events, _ = read_log_tail(str(path), 10_000)
+    assert len(events) == 1
+
+def test_snapshot_plus_tail_recovers_the_session(tmp_path):
+    log = tmp_path / "game_status.log"
+    snapshot = str(tmp_path / "snapshot.json")
+    log.write_text("".join(json.dumps(e) + "\n" for e in
+                           [ev("Accepted", "Lobby"), ev("Assign", GameID="P1_1_1"), ev("ResultReceived", GameID="P1_1_1")]))
+    SessionSnapshotter(str(log), snapshot).snapshot()
+    with open(log, "a") as f:
+        f.write(json.dumps(ev("Assign", GameName="MemoryGame", GameID="P1_2_1")) + "\n")
+    state = SessionSnapshotter(str(log), snapshot).recover()["P1"]
+    assert state["games_done"] == 1 and state["game_id"] == "P1_2_1"
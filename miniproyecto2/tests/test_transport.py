@@ -0,0 +1,99 @@
+import socket, struct, threading
+import pytest
+from transport import (_Mailbox, _send_frame, _recv_frame, _reachable, parse_address,
+                       MAX_FRAME, FileTransport)
+
+
+@pytest.fixture
+def pair():
+    a, b = socket.socketpair()
+    yield a, b
+    a.close()
+    b.close()
+
+
+# ---------- Framing ----------
+def test_frame_round_trip(pair):
+    a, b = pair
+    _send_frame(a, threading.Lock(), "assign", "P1", {"GameName": "MemoryGame", "Nombre": "Pokémon"})
+    kind, message = _recv_frame(b)
+    assert kind == "assign"
+    assert message == {"GameName": "MemoryGame", "Nombre": "Pokémon", "PlayerID": "P1"}
+
+def test_back_to_back_frames_stay_apart(pair):
+    a, b = pair
+    lock = threading.Lock()
+    for i in range(50):
+        _send_frame(a, lock, "heartbeat", "P1", {"N": i})
+    assert [_recv_frame(b)[1]["N"] for _ in range(50)] == list(range(50))
+
+def test_frame_split_across_reads(pair):
+    a, b = pair
+    data = b'{"Kind":"ack","PlayerID":"P1"}'
+    frame = struct.pack("!I", len(data)) + data
+    threading.Thread(target=lambda: [a.sendall(frame[i:i + 3]) for i in range(0, len(frame), 3)]).start()
+    assert _recv_frame(b) == ("ack", {"PlayerID": "P1"})
+
+def test_oversized_frame_is_refused(pair):
+    a, b = pair
+    a.sendall(struct.pack("!I", MAX_FRAME + 1))
+    with pytest.raises(ConnectionError):
+        _recv_frame(b)
+
+def test_closed_mid_frame(pair):
+    a, b = pair
+    a.sendall(struct.pack("!I", 100) + b"{")
+    a.close()
+    with pytest.raises(ConnectionError):
+        _recv_frame(b)
+
+
+# ---------- Addresses ----------
+def test_parse_address():
+    assert parse_address("tcp://10.0.0.2:5555") == (socket.AF_INET, ("10.0.0.2", 5555))
+    assert parse_address("tcp://:5555") == (socket.AF_INET, ("0.0.0.0", 5555))
+    assert parse_address("unix:/tmp/host.sock") == (socket.AF_UNIX, "/tmp/host.sock")
+    with pytest.raises(ValueError):
+        parse_address("udp://host:1")
+
+def test_workers_on_any_address_are_reached_through_the_joined_host():
+    assert _reachable("tcp://0.0.0.0:5557", "tcp://192.168.0.24:5555") == "tcp://192.168.0.24:5557"
+    assert _reachable("unix:/tmp/host.shard_1.sock", "unix:/tmp/host.sock") == "unix:/tmp/host.shard_1.sock"
+
+
+# ---------- Mailbox ----------
+def test_mailbox_keeps_kinds_and_players_apart():
+    box = _Mailbox()
+    box.put("result", "P1", {"N": 1})
+    box.put("result", "P2", {"N": 2})
+    box.put("heartbeat", "P1", {"N": 3})
+    assert box.get("result", "P1", 0) == {"N": 1}
+    assert box.get("result", "P1", 0) is None
+    assert box.get_first(["assign", "heartbeat"], "P1", 0) == ("heartbeat", {"N": 3})
+    assert box.get_any("result", 0) == [("P2", {"N": 2})]
+
+def test_mailbox_wakes_a_waiting_reader():
+    box = _Mailbox()
+    threading.Timer(0.05, box.put, args=("ack", "P1", {"ok": True})).start()
+    assert box.get("ack", "P1", timeout=5) == {"ok": True}
+
+def test_closed_mailbox_returns_nothing():
+    box = _Mailbox()
+    box.close()
+    assert box.get("ack", "P1") is None
+    assert box.get_first(["ack"], "P1") == (None, None)
+
+
+# ---------- File drop ----------
+def test_file_transport_round_trip(tmp_path):
+    host = FileTransport(str(tmp_path))
+    player = FileTransport(str(tmp_path))
+    try:
+        player.send("join", "P1", {"PlayerID": "P1"})
+        assert host.recv_any("join", timeout=5) == [("P1", {"PlayerID": "P1"})]
+        host.send("ack", "P1", {"Action": "Accepted"})
+        assert player.recv("ack", "P1", timeout=5) == {"Action": "Accepted"}
+        assert list(tmp_path.iterdir()) == []  # every message is consumed
+    finally:
+        host.close()
+        player.close()
@@ -0,0 +1,346 @@
+import os, json, time, socket, struct, threading
+from collections import deque
+from folder_watcher import FolderWatcher
+
+# Host <-> player message set. The host sends ack/assign/sabotage (and route
+# when sharded), the player sends join/result/heartbeat; every transport
+# carries the same JSON payloads.
+MESSAGE_KINDS = ("join", "ack", "assign", "result", "sabotage", "heartbeat", "route")
+
+_FRAME_HEADER = struct.Struct("!I")
+MAX_FRAME = 1 << 20
+
+
+# ---------- Mailbox ----------
+class _Mailbox:
+    """Messages received but not yet consumed, keyed by (kind, PlayerID)."""
+
+    def __init__(self):
+        self._cond = threading.Condition()
+        self._boxes = {}
+        self.closed = False
+
+    def put(self, kind, player_id, message):
+        with self._cond:
+            self._boxes.setdefault((kind, player_id), deque()).append(message)
+            self._cond.notify_all()
+
+    def get(self, kind, player_id, timeout=None):
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            while True:
+                box = self._boxes.get((kind, player_id))
+                if box:
+                    return box.popleft()
+                if self.closed:
+                    return None
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return None
+                self._cond.wait(remaining)
+
+    def get_first(self, kinds, player_id, timeout=None):
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            while True:
+                for kind in kinds:
+                    box = self._boxes.get((kind, player_id))
+                    if box:
+                        return kind, box.popleft()
+                if self.closed:
+                    return None, None
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return None, None
+                self._cond.wait(remaining)
+
+    def get_any(self, kind, timeout=None):
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            while True:
+                ready = [key for key, box in self._boxes.items() if key[0] == kind and box]
+                if ready or self.closed:
+                    return [(pid, self._boxes[(k, pid)].popleft()) for k, pid in ready]
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return []
+                self._cond.wait(remaining)
+
+    def close(self):
+        with self._cond:
+            self.closed = True
+            self._cond.notify_all()
+
+
+# ---------- File-drop transport ----------
+def read_message(path, retries=20):
+    # The file can show up before its writer has finished dumping the JSON
+    for attempt in range(retries):
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            os.remove(path)
+            return data
+        except json.JSONDecodeError:
+            if attempt == retries - 1:
+                raise
+            time.sleep(0.01)
+
+class FileTransport:
+    """Original protocol: one `<kind>_<PlayerID>.json` file per message in a shared folder."""
+
+    def __init__(self, folder, watcher=None):
+        self.folder = folder
+        os.makedirs(folder, exist_ok=True)
+        self.watcher = watcher or FolderWatcher(folder)
+        self.closed = False
+        self._shards = {}
+        self._shards_lock = threading.Lock()
+
+    def shard(self, name):
+        """Transport for the `name` sub-folder of a sharded host, one per shard."""
+        with self._shards_lock:
+            if name not in self._shards:
+                self._shards[name] = FileTransport(os.path.join(self.folder, name))
+            return self._shards[name]
+
+    def send(self, kind, player_id, message):
+        path = os.path.join(self.folder, f"{kind}_{player_id}.json")
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(message, f, ensure_ascii=False, separators=(",", ":"))
+        os.replace(tmp_path, path)  # readers never see a half-written message
+
+    def recv(self, kind, player_id, timeout=None):
+        return self.recv_first([kind], player_id, timeout)[1]
+
+    def recv_first(self, kinds, player_id, timeout=None):
+        """Waits for whichever of `kinds` arrives first; returns (kind, message) or (None, None)."""
+        names = [f"{kind}_{player_id}.json" for kind in kinds]
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            remaining = None if deadline is None else max(0, deadline - time.monotonic())
+            path = self.watcher.wait_for_first(names, remaining)
+            if path is None:
+                return None, None
+            try:
+                return kinds[names.index(os.path.basename(path))], read_message(path)
+            except FileNotFoundError:
+                continue  # consumed by someone else in the meantime
+
+    def recv_any(self, kind, timeout=None):
+        messages = []
+        for name in self.watcher.wait_for_any(f"{kind}_", timeout=timeout):
+            player_id = name[len(kind) + 1:-len(".json")]
+            try:
+                messages.append((player_id, read_message(os.path.join(self.folder, name))))
+            except FileNotFoundError:
+                continue
+            except (OSError, json.JSONDecodeError) as e:
+                print(f"❌ Invalid {kind} message from {player_id}: {e}")
+        return messages
+
+    def close(self):
+        self.closed = True
+        self.watcher.stop()
+        for shard in self._shards.values():
+            shard.close()
+
+
+# ---------- Socket transport ----------
+def _send_frame(sock, lock, kind, player_id, message):
+    payload = dict(message, Kind=kind, PlayerID=player_id)
+    data = json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    with lock:
+        sock.sendall(_FRAME_HEADER.pack(len(data)) + data)
+
+def _recv_exact(sock, size):
+    buf = bytearray()
+    while len(buf) < size:
+        chunk = sock.recv(size - len(buf))
+        if not chunk:
+            raise ConnectionError("connection closed")
+        buf += chunk
+    return bytes(buf)
+
+def _recv_frame(sock):
+    (size,) = _FRAME_HEADER.unpack(_recv_exact(sock, _FRAME_HEADER.size))
+    if size > MAX_FRAME:
+        raise ConnectionError(f"frame too large ({size} bytes)")
+    message = json.loads(_recv_exact(sock, size).decode("utf-8"))
+    return message.pop("Kind"), message
+
+def parse_address(address):
+    """'unix:/path/host.sock' or 'tcp://host:port' -> (family, sockaddr)."""
+    if address.startswith("unix:"):
+        return socket.AF_UNIX, address[len("unix:"):]
+    if address.startswith("tcp://"):
+        host, _, port = address[len("tcp://"):].rpartition(":")
+        return socket.AF_INET, (host or "0.0.0.0", int(port))
+    raise ValueError(f"Unknown transport address: {address}")
+
+def _tune(sock):
+    if sock.family == socket.AF_INET:
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+class SocketServerTransport:
+    """Host side: players keep one persistent connection and exchange
+    length-prefixed JSON frames over it."""
+
+    def __init__(self, address, backlog=1024):
+        self.address = address
+        family, sockaddr = parse_address(address)
+        if family == socket.AF_UNIX and os.path.exists(sockaddr):
+            os.remove(sockaddr)
+        self._server = socket.socket(family, socket.SOCK_STREAM)
+        if family == socket.AF_INET:
+            self._server.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self._server.bind(sockaddr)
+        self._server.listen(backlog)
+        self._mailbox = _Mailbox()
+        self._lock = threading.Lock()
+        self._peers = {}  # PlayerID -> (socket, send lock)
+        threading.Thread(target=self._accept_loop, name="transport-accept", daemon=True).start()
+
+    def _accept_loop(self):
+        while not self._mailbox.closed:
+            try:
+                conn, _ = self._server.accept()
+            except OSError:
+                return
+            _tune(conn)
+            threading.Thread(target=self._reader, args=(conn,), daemon=True).start()
+
+    def _reader(self, conn):
+        peer = (conn, threading.Lock())
+        player_ids = set()
+        try:
+            while True:
+                kind, message = _recv_frame(conn)
+                player_id = message.get("PlayerID")
+                if player_id not in player_ids:
+                    player_ids.add(player_id)
+                    with self._lock:
+                        self._peers[player_id] = peer
+                self._mailbox.put(kind, player_id, message)
+        except (OSError, ConnectionError, ValueError):
+            pass
+        finally:
+            with self._lock:
+                for player_id in player_ids:
+                    if self._peers.get(player_id) is peer:
+                        del self._peers[player_id]
+            conn.close()
+
+    @property
+    def closed(self):
+        return self._mailbox.closed
+
+    def send(self, kind, player_id, message):
+        with self._lock:
+            peer = self._peers.get(player_id)
+        if peer is None:
+            raise ConnectionError(f"{player_id} is not connected")
+        _send_frame(peer[0], peer[1], kind, player_id, message)
+
+    def recv(self, kind, player_id, timeout=None):
+        return self._mailbox.get(kind, player_id, timeout)
+
+    def recv_first(self, kinds, player_id, timeout=None):
+        return self._mailbox.get_first(kinds, player_id, timeout)
+
+    def recv_any(self, kind, timeout=None):
+        return self._mailbox.get_any(kind, timeout)
+
+    def close(self):
+        self._mailbox.close()
+        self._server.close()
+        with self._lock:
+            peers, self._peers = list(self._peers.values()), {}
+        for conn, _ in peers:
+            conn.close()
+
+class SocketClientTransport:
+    """Player side of the socket transport: one persistent connection to the host."""
+
+    def __init__(self, address, timeout=10):
+        family, sockaddr = parse_address(address)
+        self._sock = socket.create_connection(sockaddr, timeout) if family == socket.AF_INET \
+            else socket.socket(family, socket.SOCK_STREAM)
+        if family == socket.AF_UNIX:
+            self._sock.settimeout(timeout)
+            self._sock.connect(sockaddr)
+        self._sock.settimeout(None)
+        _tune(self._sock)
+        self._send_lock = threading.Lock()
+        self._mailbox = _Mailbox()
+        threading.Thread(target=self._reader, name="transport-reader", daemon=True).start()
+
+    def _reader(self):
+        try:
+            while True:
+                kind, message = _recv_frame(self._sock)
+                self._mailbox.put(kind, message.get("PlayerID"), message)
+        except (OSError, ConnectionError, ValueError):
+            self._mailbox.close()
+
+    @property
+    def closed(self):
+        return self._mailbox.closed
+
+    def send(self, kind, player_id, message):
+        _send_frame(self._sock, self._send_lock, kind, player_id, message)
+
+    def recv(self, kind, player_id, timeout=None):
+        return self._mailbox.get(kind, player_id, timeout)
+
+    def recv_first(self, kinds, player_id, timeout=None):
+        return self._mailbox.get_first(kinds, player_id, timeout)
+
+    def recv_any(self, kind, timeout=None):
+        return self._mailbox.get_any(kind, timeout)
+
+    def close(self):
+        self._mailbox.close()
+        try:
+            self._sock.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+        self._sock.close()
+
+
+# ---------- Factory ----------
+def open_transport(spec, role, folder="host_folder", watcher=None):
+    """`spec` is 'file', 'file:<folder>', 'unix:<path>' or 'tcp://host:port';
+    `role` is 'host' (server side) or 'player' (client side)."""
+    if spec == "file" or spec.startswith("file:"):
+        return FileTransport(spec[len("file:"):] or folder, watcher)
+    if role == "host":
+        return SocketServerTransport(spec)
+    return SocketClientTransport(spec)
+
+
+# ---------- Player side ----------
+def _reachable(address, spec):
+    # Workers bound to 0.0.0.0 are reached through the host the player already used
+    if address.startswith("tcp://0.0.0.0:") and spec.startswith("tcp://"):
+        host = spec[len("tcp://"):].rpartition(":")[0]
+        return f"tcp://{host}:{address.rpartition(':')[2]}"
+    return address
+
+def join_host(spec, player_id, join, timeout=None, folder="host_folder", transport=None):
+    """Sends Join and, if the host is sharded, follows its Route reply to the
+    worker that owns this PlayerID. Returns (transport, ack); ack is None on timeout."""
+    transport = transport or open_transport(spec, "player", folder)
+    transport.send("join", player_id, join)
+    kind, message = transport.recv_first(["ack", "route"], player_id, timeout)
+    if kind != "route":
+        return transport, message
+    if isinstance(transport, FileTransport):
+        # The router already forwarded the Join into the shard folder
+        shard = transport.shard(message["Shard"])
+    else:
+        transport.close()
+        shard = SocketClientTransport(_reachable(message["Address"], spec))
+        shard.send("join", player_id, join)
+    return shard, shard.recv("ack", player_id, timeout)